@@ -1,6 +1,45 @@
+import os
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'core'
\ No newline at end of file
+    name = 'core'
+    
+    def ready(self):
+        # Keep users cached by CachedAuthenticationMiddleware in sync
+        from django.db.models.signals import post_save, post_delete
+        from core.middleware.auth_middleware import invalidate_cached_user_on_change
+        post_save.connect(invalidate_cached_user_on_change, sender=settings.AUTH_USER_MODEL)
+        post_delete.connect(invalidate_cached_user_on_change, sender=settings.AUTH_USER_MODEL)
+        
+        # Recompute dashboard statistics when the underlying data changes,
+        # and the cached filter choices of the list views
+        from core.utils import invalidate_dashboard_stats, invalidate_filter_choices
+        for model in (settings.AUTH_USER_MODEL, 'core.Task', 'core.Project'):
+            for receiver in (invalidate_dashboard_stats, invalidate_filter_choices):
+                post_save.connect(receiver, sender=model)
+                post_delete.connect(receiver, sender=model)
+        
+        # Refresh the cached vector database metadata after (re)indexing
+        from core.utils import invalidate_vector_db_metadata
+        post_save.connect(invalidate_vector_db_metadata, sender='core.VectorDBMetadata')
+        post_delete.connect(invalidate_vector_db_metadata, sender='core.VectorDBMetadata')
+        
+        # Directory the FAISS index is stored in
+        from core.utils import ensure_dir
+        ensure_dir(settings.VECTOR_DB_PATH)
+        
+        # OpenMP/MKL size their thread pools once, when torch is first
+        # imported by core.vectorization, so these must be set before that
+        num_threads = str(getattr(settings, 'TORCH_NUM_THREADS', os.cpu_count() or 4))
+        os.environ.setdefault('OMP_NUM_THREADS', num_threads)
+        os.environ.setdefault('MKL_NUM_THREADS', num_threads)
+        
+        # Load the shared vectorizer up front so the first search request
+        # doesn't pay for loading the embedding model
+        if getattr(settings, 'VECTORIZER_PRELOAD', False):
+            from core.vectorization import get_vectorizer
+            get_vectorizer()
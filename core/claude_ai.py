@@ -1,6 +1,7 @@
 import os
 import json
 import logging
+import threading
 from typing import Dict, List, Optional, Any, Tuple
 from anthropic import Anthropic
 from datetime import datetime
@@ -233,6 +234,27 @@ class ClaudeAI:
         except ChatSession.DoesNotExist:
             raise ClaudeAIError(f"Chat session {session_id} not found")
     
+    def add_messages(self, session_id: str, messages: List[Tuple[str, str]]) -> None:
+        """
+        Add several messages to the chat session in one transaction.
+        
+        Args:
+            session_id: ID of the chat session
+            messages: List of (role, content) tuples, in chronological order
+        """
+        from django.db import transaction
+        from core.models import ChatSession, ChatMessage
+        
+        with transaction.atomic():
+            # Touch the session timestamp; this also verifies the session exists
+            if not ChatSession.objects.filter(id=session_id).update(updated_at=timezone.now()):
+                raise ClaudeAIError(f"Chat session {session_id} not found")
+            
+            ChatMessage.objects.bulk_create([
+                ChatMessage(session_id=session_id, role=role, content=content)
+                for role, content in messages
+            ])
+    
     def process_user_message(self, session_id: str, message: str) -> str:
         """
         Process a user message and get a response from Claude AI.
@@ -555,7 +577,7 @@ class ClaudeAI:
             Dictionary with context data
         """
         try:
-            from core.planfix_api import PlanfixAPI
+            from core.planfix_api import get_planfix_api
             from core.models import User
             
             user = User.objects.get(id=user_id)
@@ -564,8 +586,8 @@ class ClaudeAI:
             if not planfix_id:
                 return {}
                 
-            # Initialize Planfix API
-            api = PlanfixAPI()
+            # Shared Planfix API client
+            api = get_planfix_api()
             
             # Get user's tasks and stats
             try:
@@ -601,4 +623,25 @@ class ClaudeAI:
                 
         except Exception as e:
             logger.error(f"Error getting Planfix data context: {str(e)}")
-            return {}
\ No newline at end of file
+            return {}
+
+
+_claude_ai = None
+_claude_ai_lock = threading.Lock()
+
+
+def get_claude_ai() -> ClaudeAI:
+    """
+    Get the process-wide ClaudeAI client, creating it on first use.
+    
+    The Anthropic client keeps a connection pool, so views share one
+    instance instead of building a new client (and TLS session) per request.
+    """
+    global _claude_ai
+    
+    if _claude_ai is None:
+        with _claude_ai_lock:
+            if _claude_ai is None:
+                _claude_ai = ClaudeAI()
+    
+    return _claude_ai
@@ -0,0 +1,14 @@
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with an OWASP recommended profile (m=46 MiB, t=1, p=1).
+
+    Hashes keep the 'argon2' algorithm name, so ones created with Django's
+    default parameters still verify and are rehashed on the next login.
+    """
+
+    time_cost = 1
+    memory_cost = 46 * 1024
+    parallelism = 1
@@ -331,7 +331,7 @@ class Command(BaseCommand):
                     page_size = limit - total_tasks
                 
                 # Get tasks for this page
-                tasks_data = api.get_tasks(filters=filters, limit=page_size, offset=offset)
+                tasks_data = api.get_tasks(filters=filters, limit=page_size, offset=offset, fields='id')
                 tasks = tasks_data.get('tasks', [])
                 
                 if not tasks:
@@ -339,6 +339,10 @@ class Command(BaseCommand):
                 
                 self.stdout.write(f'Processing {len(tasks)} tasks (offset: {offset})')
                 
+                # Get detailed task data for the whole page in one batch
+                task_ids = [task_data.get('id') for task_data in tasks if task_data.get('id')]
+                task_details_map = api.get_tasks_by_ids(task_ids)
+                
                 # Process each task
                 for task_data in tasks:
                     try:
@@ -346,7 +350,7 @@ class Command(BaseCommand):
                             planfix_id = str(task_data.get('id'))
                             
                             # Get detailed task data
-                            task_details = api.get_task(planfix_id)
+                            task_details = task_details_map.get(int(planfix_id)) or api.get_task(planfix_id)
                             
                             # Try to find existing task by Planfix ID
                             task = Task.objects.filter(planfix_id=planfix_id).first()
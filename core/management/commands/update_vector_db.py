@@ -4,7 +4,7 @@ from django.core.management.base import BaseCommand
 from django.conf import settings
 from django.utils import timezone
 
-from core.vectorization import Vectorizer, VectorizationError
+from core.vectorization import Vectorizer, VectorizationError, VECTORIZE_CHUNK_SIZE
 from core.models import LogEntry, VectorDBMetadata
 
 logger = logging.getLogger(__name__)
@@ -185,13 +185,20 @@ class Command(BaseCommand):
                 'errors': []
             }
             
+            # Skip periodic saves while adding vectors; the index is saved once below
+            vectorizer._bulk_mode = True
+            
+            # One timestamp for every vector added in this run
+            now_iso = timezone.now().isoformat()
+            
             # Update tasks
             if update_all or tasks_only:
                 self.stdout.write('Updating task vectors...')
                 unvectorized_tasks = Task.objects.filter(vector_id__isnull=True)
                 self.stdout.write(f'Found {unvectorized_tasks.count()} unvectorized tasks')
                 
-                for task in unvectorized_tasks:
+                updated_tasks = []
+                for task in unvectorized_tasks.select_related('project').iterator(chunk_size=VECTORIZE_CHUNK_SIZE):
                     try:
                         # Prepare text for vectorization
                         task_text = f"""
@@ -221,17 +228,23 @@ class Command(BaseCommand):
                         }
                         
                         # Add vector
-                        vector_id = vectorizer.add_vector(task_text, metadata)
+                        vector_id = vectorizer.add_vector(task_text, metadata, now_iso)
                         
-                        # Update task with vector ID
+                        # Update task with vector ID (written in bulk below)
                         task.vector_id = str(vector_id)
-                        task.save(update_fields=['vector_id'])
+                        updated_tasks.append(task)
                         
                         stats['tasks'] += 1
                         
                     except Exception as e:
                         logger.error(f"Error vectorizing task {task.id}: {str(e)}")
                         stats['errors'].append(f"Task {task.id}: {str(e)}")
+                    
+                    if len(updated_tasks) >= VECTORIZE_CHUNK_SIZE:
+                        Task.objects.bulk_update(updated_tasks, ['vector_id'])
+                        updated_tasks = []
+                
+                Task.objects.bulk_update(updated_tasks, ['vector_id'])
             
             # Update projects
             if update_all or projects_only:
@@ -239,7 +252,8 @@ class Command(BaseCommand):
                 unvectorized_projects = Project.objects.filter(vector_id__isnull=True)
                 self.stdout.write(f'Found {unvectorized_projects.count()} unvectorized projects')
                 
-                for project in unvectorized_projects:
+                updated_projects = []
+                for project in unvectorized_projects.iterator(chunk_size=VECTORIZE_CHUNK_SIZE):
                     try:
                         # Prepare text for vectorization
                         project_text = f"""
@@ -265,17 +279,23 @@ class Command(BaseCommand):
                         }
                         
                         # Add vector
-                        vector_id = vectorizer.add_vector(project_text, metadata)
+                        vector_id = vectorizer.add_vector(project_text, metadata, now_iso)
                         
-                        # Update project with vector ID
+                        # Update project with vector ID (written in bulk below)
                         project.vector_id = str(vector_id)
-                        project.save(update_fields=['vector_id'])
+                        updated_projects.append(project)
                         
                         stats['projects'] += 1
                         
                     except Exception as e:
                         logger.error(f"Error vectorizing project {project.id}: {str(e)}")
                         stats['errors'].append(f"Project {project.id}: {str(e)}")
+                    
+                    if len(updated_projects) >= VECTORIZE_CHUNK_SIZE:
+                        Project.objects.bulk_update(updated_projects, ['vector_id'])
+                        updated_projects = []
+                
+                Project.objects.bulk_update(updated_projects, ['vector_id'])
             
             # Update comments
             if update_all or comments_only:
@@ -283,7 +303,8 @@ class Command(BaseCommand):
                 unvectorized_comments = Comment.objects.filter(vector_id__isnull=True)
                 self.stdout.write(f'Found {unvectorized_comments.count()} unvectorized comments')
                 
-                for comment in unvectorized_comments:
+                updated_comments = []
+                for comment in unvectorized_comments.select_related('task', 'author').iterator(chunk_size=VECTORIZE_CHUNK_SIZE):
                     try:
                         # Prepare text for vectorization
                         comment_text = f"""
@@ -304,17 +325,28 @@ class Command(BaseCommand):
                         }
                         
                         # Add vector
-                        vector_id = vectorizer.add_vector(comment_text, metadata)
+                        vector_id = vectorizer.add_vector(comment_text, metadata, now_iso)
                         
-                        # Update comment with vector ID
+                        # Update comment with vector ID (written in bulk below)
                         comment.vector_id = str(vector_id)
-                        comment.save(update_fields=['vector_id'])
+                        updated_comments.append(comment)
                         
                         stats['comments'] += 1
                         
                     except Exception as e:
                         logger.error(f"Error vectorizing comment {comment.id}: {str(e)}")
                         stats['errors'].append(f"Comment {comment.id}: {str(e)}")
+                    
+                    if len(updated_comments) >= VECTORIZE_CHUNK_SIZE:
+                        Comment.objects.bulk_update(updated_comments, ['vector_id'])
+                        updated_comments = []
+                
+                Comment.objects.bulk_update(updated_comments, ['vector_id'])
+            
+            vectorizer._bulk_mode = False
+            
+            # Switch to IVF-PQ once the index is large enough to train it
+            vectorizer._upgrade_to_ivf_index()
             
             # Save index
             vectorizer._save_faiss_index()
@@ -344,6 +376,7 @@ class Command(BaseCommand):
                     self.stdout.write(f'    - ... and {len(stats["errors"]) - 5} more errors')
             
         except Exception as e:
+            vectorizer._bulk_mode = False
             self.stdout.write(
                 self.style.ERROR(f'Error updating vector database: {str(e)}')
             )
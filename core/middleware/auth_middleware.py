@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import SESSION_KEY, HASH_SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+
+def user_cache_key(user_id):
+    return f'auth_user:{user_id}'
+
+
+def invalidate_cached_user(user_id):
+    """Drop the cached user so the next request reloads it from the database."""
+    cache.delete(user_cache_key(user_id))
+
+
+def invalidate_cached_user_on_change(sender, instance, **kwargs):
+    """post_save/post_delete receiver for the user model."""
+    invalidate_cached_user(instance.pk)
+
+
+def _load_user(request):
+    try:
+        user_id = request.session[SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+
+    key = user_cache_key(user_id)
+    user = cache.get(key)
+
+    # Same session hash check as auth.get_user(), so a password change still
+    # logs out other sessions; anything unusual falls back to the full lookup
+    if user is not None:
+        session_hash = request.session.get(HASH_SESSION_KEY)
+        if session_hash and constant_time_compare(session_hash, user.get_session_auth_hash()):
+            return user
+
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        cache.set(key, user, getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 300))
+
+    return user
+
+
+def get_cached_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = _load_user(request)
+    return request._cached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware that keeps the user object in the cache."""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+
+
+class UserRoleMiddleware:
+    """
+    Set request.is_admin and request.is_manager from the user's role.
+
+    is_manager is also true for administrators, like User.is_manager. Must
+    come after the authentication middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user = request.user
+        is_authenticated = user.is_authenticated
+        request.is_admin = is_authenticated and user.is_administrator
+        request.is_manager = is_authenticated and user.is_manager
+        return self.get_response(request)
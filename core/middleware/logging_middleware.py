@@ -1 +1,23 @@
-# Logging middleware will go here
\ No newline at end of file
+from django.core.signals import request_finished
+
+from core.utils import start_log_buffer, flush_log_buffer
+
+
+def _flush_on_request_finished(sender, **kwargs):
+    flush_log_buffer()
+
+
+# request_finished fires once the response has been delivered, which keeps
+# the LogEntry insert out of the response latency
+request_finished.connect(_flush_on_request_finished, dispatch_uid='core.flush_log_buffer')
+
+
+class LogEntryBufferMiddleware:
+    """Buffer log_event() calls made while handling a request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start_log_buffer()
+        return self.get_response(request)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='last_active',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-16 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_user_last_active_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['name'], name='core_projec_name_0563a9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_date'], name='core_task_created_b5c48e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['title'], name='core_task_title_9e5e6f_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-16 13:00
+
+from django.db import migrations
+
+# (index name, table, column) of the columns searched with icontains
+TRIGRAM_INDEXES = (
+    ('core_task_title_trgm', 'core_task', 'title'),
+    ('core_task_description_trgm', 'core_task', 'description'),
+    ('core_project_name_trgm', 'core_project', 'name'),
+    ('core_project_description_trgm', 'core_project', 'description'),
+    ('core_user_username_trgm', 'core_user', 'username'),
+    ('core_user_first_name_trgm', 'core_user', 'first_name'),
+    ('core_user_last_name_trgm', 'core_user', 'last_name'),
+    ('core_user_email_trgm', 'core_user', 'email'),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm GIN indexes serve ILIKE '%...%' directly; other backends keep
+    # scanning as before
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_task_project_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
+from django.core.cache import cache
 import uuid
 import json
 
@@ -20,14 +21,22 @@ class User(AbstractUser):
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='collaborator')
     profile_image = models.ImageField(upload_to='profile_images/', blank=True, null=True)
     language_preference = models.CharField(max_length=10, choices=[('en', _('English')), ('ru', _('Russian'))], default='en')
-    last_active = models.DateTimeField(null=True, blank=True)
+    last_active = models.DateTimeField(null=True, blank=True, db_index=True)
     
     def __str__(self):
         return self.username
     
+    # Minimum number of seconds between two last_active writes for a user
+    LAST_ACTIVE_INTERVAL = 60
+    
     def save_last_active(self):
+        # cache.add() only succeeds for the first call in each interval
+        if not cache.add(f'user:{self.pk}:last_active_touched', True, self.LAST_ACTIVE_INTERVAL):
+            return
+        
+        # Single-column UPDATE; skips the full model save and its signals
         self.last_active = timezone.now()
-        self.save(update_fields=['last_active'])
+        User.objects.filter(pk=self.pk).update(last_active=self.last_active)
     
     @property
     def is_administrator(self):
@@ -60,6 +69,7 @@ class Project(models.Model):
             models.Index(fields=['planfix_id']),
             models.Index(fields=['status']),
             models.Index(fields=['created_date']),
+            models.Index(fields=['name']),
         ]
 
 
@@ -103,6 +113,8 @@ class Task(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['deadline']),
             models.Index(fields=['priority']),
+            models.Index(fields=['created_date']),
+            models.Index(fields=['title']),
         ]
 
 
@@ -1,8 +1,19 @@
 import os
+import asyncio
+import functools
+import hashlib
 import logging
+import threading
+import weakref
+import httpx
+import orjson
 import requests
+import zstandard
+import requests.adapters
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union, Any
+from operator import itemgetter
+from typing import Dict, List, Optional, Union, Any, Iterator, Callable
 
 from django.conf import settings
 from django.utils import timezone
@@ -11,6 +22,57 @@ from django.core.exceptions import ValidationError
 
 logger = logging.getLogger(__name__)
 
+# Task fields requested from Planfix by default (list views, summaries)
+TASK_FIELDS_DEFAULT = "id,name,status,priority,endDateTime,assignees"
+
+# Full set of task fields, for detail views and API passthrough
+TASK_FIELDS_FULL = "id,name,status,project,startDateTime,endDateTime,description,assignees,assigner,priority,resultChecking,parent,counterparty,dateTime,hasStartDate,hasEndDate,hasStartTime,hasEndTime,dateOfLastUpdate,duration,durationUnit,durationType,inFavorites,isSummary,isSequential,participants,auditors,isDeleted"
+
+# Task fields requested by get_tasks_by_ids: everything the data sync reads
+# from a task, including what tasks/{id} returns but task/list doesn't by default
+TASK_FIELDS_BATCH = f"{TASK_FIELDS_FULL},createDateTime,customFields"
+
+# Maximum number of task IDs sent in a single batched task/list request
+TASK_BATCH_SIZE = 200
+
+# Chunk size used when streaming file downloads
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Number of worker threads (and pooled connections) per PlanfixAPI instance
+POOL_MAX_WORKERS = 16
+
+# Per-key locks shared by all instances so that concurrent cache misses
+# for the same key result in a single Planfix request
+_inflight_locks = weakref.WeakValueDictionary()
+_inflight_guard = threading.Lock()
+
+# Version of the cached payload format (orjson + zstd); bumping it makes
+# Django ignore entries written in an older format
+CACHE_VERSION = 2
+
+
+def _pack(value: Any) -> bytes:
+    """Serialize and compress a value for the Django cache."""
+    return zstandard.ZstdCompressor(level=3).compress(orjson.dumps(value))
+
+
+def _unpack(blob: bytes) -> Any:
+    """Decompress and deserialize a value stored with _pack()."""
+    return orjson.loads(zstandard.ZstdDecompressor().decompress(blob))
+
+
+def _cache_get_packed(key: str) -> Any:
+    """Get a value stored with _pack() from the Django cache."""
+    blob = cache.get(key, version=CACHE_VERSION)
+    if blob is None:
+        return None
+    
+    try:
+        return _unpack(blob)
+    except (zstandard.ZstdError, orjson.JSONDecodeError) as e:
+        logger.warning(f"Discarding unreadable cache entry {key}: {str(e)}")
+        return None
+
 
 class PlanfixAPIError(Exception):
     """Custom exception for Planfix API errors."""
@@ -20,6 +82,11 @@ class PlanfixAPIError(Exception):
 class PlanfixAPI:
     """Class to interact with the Planfix API."""
     
+    __slots__ = (
+        'api_url', 'api_key', 'account_id', 'user_id', 'user_api_key',
+        '_base_url', '_headers', '_local', '_session', '_pool'
+    )
+    
     def __init__(self, api_key=None, account_id=None, user_id=None, user_api_key=None):
         self.api_url = getattr(settings, 'PLANFIX_API_URL', 'https://deventky.planfix.com/rest')
         self.api_key = api_key or getattr(settings, 'PLANFIX_API_TOKEN', None)
@@ -27,53 +94,152 @@ class PlanfixAPI:
         self.user_id = user_id or getattr(settings, 'PLANFIX_USER_ID', None)
         self.user_api_key = user_api_key or getattr(settings, 'PLANFIX_USER_API_KEY', None)
         
+        # Per-thread memo in front of the Django cache. The client is shared by
+        # all request threads, so each thread gets its own dict, reset per
+        # request by get_planfix_api(); threads without one (e.g. the worker pool)
+        # go straight to the Django cache
+        self._local = threading.local()
+        self._local.memo = {}
+        
         # Validate required settings
         if not all([self.api_key, self.account_id]):
             raise ValidationError("Missing required Planfix API configuration.")
-    
-    def _get_headers(self) -> Dict[str, str]:
-        """Get default headers for API requests."""
-        headers = {
+        
+        # Normalize the base URL and build the headers once per instance
+        base_url = self.api_url.rstrip('/')
+        if not base_url.startswith('https://'):
+            base_url = f"https://{base_url}"
+        self._base_url = base_url
+        self._headers = {
             'Content-Type': 'application/json',
             'Accept': 'application/json',
             'Authorization': f'Bearer {self.api_key}'
         }
-        return headers
+        
+        # Long-lived HTTP session and worker pool shared by all methods;
+        # the connection pool is sized so pool workers never wait for a socket
+        self._session = requests.Session()
+        self._session.headers.update(self._headers)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAX_WORKERS)
+        self._session.mount('https://', adapter)
+        self._pool = ThreadPoolExecutor(max_workers=POOL_MAX_WORKERS, thread_name_prefix='planfix-io')
+    
+    def close(self) -> None:
+        """Release the worker pool and the HTTP session."""
+        self._pool.shutdown(wait=False)
+        self._session.close()
+    
+    def _get_headers(self) -> Dict[str, str]:
+        """Get default headers for API requests."""
+        return self._headers
+    
+    @staticmethod
+    def _cache_key(prefix: str, offset: int, limit: int, filters: Dict = None, fields: str = None) -> str:
+        """Build a stable cache key for paginated list requests."""
+        if not filters and not fields:
+            return f"{prefix}_{offset}_{limit}"
+        
+        # Hash filters and the field projection so that different queries
+        # do not share a cache entry
+        query_digest = hashlib.blake2b(
+            orjson.dumps([filters, fields], option=orjson.OPT_SORT_KEYS, default=str),
+            digest_size=8
+        ).hexdigest()
+        return f"{prefix}_{offset}_{limit}_{query_digest}"
+    
+    def _memo(self) -> Optional[Dict]:
+        """Get the calling thread's memo, or None if it doesn't have one."""
+        return getattr(self._local, 'memo', None)
+    
+    def _cache_get(self, key: str) -> Any:
+        """Get a value from the local memo, falling back to the Django cache."""
+        memo = self._memo()
+        if memo is not None and key in memo:
+            return memo[key]
+        
+        value = _cache_get_packed(key)
+        if value is not None and memo is not None:
+            memo[key] = value
+        return value
+    
+    def _cache_set(self, key: str, value: Any, timeout: int) -> None:
+        """Store a value in both the local memo and the Django cache."""
+        memo = self._memo()
+        if memo is not None:
+            memo[key] = value
+        cache.set(key, _pack(value), timeout, version=CACHE_VERSION)
+    
+    def _cached_call(self, key: str, timeout: int, fetch_fn: Callable[[], Any]) -> Any:
+        """
+        Get a value from the cache, fetching it on a miss.
+        
+        Only one caller per key runs fetch_fn at a time; the others wait for it
+        and then read the freshly cached value.
+        
+        Args:
+            key: Cache key
+            timeout: Cache timeout in seconds
+            fetch_fn: Callable returning the value to cache
+            
+        Returns:
+            Cached or freshly fetched value
+        """
+        value = self._cache_get(key)
+        if value:
+            return value
+        
+        with _inflight_guard:
+            lock = _inflight_locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                _inflight_locks[key] = lock
+        
+        with lock:
+            # Another caller may have filled the cache while we were waiting
+            value = _cache_get_packed(key)
+            if value:
+                memo = self._memo()
+                if memo is not None:
+                    memo[key] = value
+                return value
+            
+            value = fetch_fn()
+            self._cache_set(key, value, timeout)
+            return value
+    
+    def clear_local(self) -> None:
+        """Start a fresh local memo for the calling thread."""
+        self._local.memo = {}
     
     def _make_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict:
         """Make a request to the Planfix API."""
         # Формируем URL без параметров
-        base_url = self.api_url.rstrip('/')
-        if not base_url.startswith('https://'):
-            base_url = f"https://{base_url}"
-        url = f"{base_url}/{endpoint}"
-        
-        headers = self._get_headers()
+        url = f"{self._base_url}/{endpoint}"
+        headers = self._headers
         
         # Формируем JSON запрос
         if data:
             request_data = data
-            logger.debug(f"Request URL: {url}")
-            logger.debug(f"Request headers: {headers}")
-            logger.debug(f"Request JSON: {request_data}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Request URL: %s", url)
+                logger.debug("Request headers: %s", headers)
+                logger.debug("Request JSON: %s", request_data)
         
         try:
-            # Создаем сессию для более точного контроля над запросом
-            session = requests.Session()
-            
             # Убираем params из URL, так как они передаются в JSON
-            response = session.request(
+            # Тело сериализуем через orjson, заголовки уже заданы в сессии
+            response = self._session.request(
                 method=method,
                 url=url,
-                headers=headers,
-                json=request_data if data else None,
+                data=orjson.dumps(request_data) if data else None,
                 params=None,  # Явно указываем, что параметров в URL быть не должно
                 allow_redirects=True  # Разрешаем следовать за перенаправлениями
             )
             
-            logger.debug(f"Response status: {response.status_code}")
-            logger.debug(f"Response headers: {response.headers}")
-            logger.debug(f"Final URL: {response.url}")  # Добавляем логирование финального URL
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response status: %s", response.status_code)
+                logger.debug("Response headers: %s", response.headers)
+                logger.debug("Final URL: %s", response.url)  # Добавляем логирование финального URL
             
             # Проверяем, что ответ не пустой
             if not response.content:
@@ -81,11 +247,11 @@ class PlanfixAPI:
                 raise PlanfixAPIError("Empty response received from Planfix API")
             
             # Логируем содержимое ответа
-            logger.debug(f"Response content: {response.content}")
+            logger.debug("Response content: %s", response.content)
             
             try:
-                return response.json()
-            except ValueError as e:
+                return orjson.loads(response.content)
+            except orjson.JSONDecodeError as e:
                 logger.error(f"Failed to parse JSON response: {str(e)}")
                 logger.error(f"Response content: {response.content}")
                 raise PlanfixAPIError(f"Invalid JSON response from Planfix API: {str(e)}")
@@ -94,19 +260,43 @@ class PlanfixAPI:
             logger.error(f"Planfix API error: {str(e)}")
             if hasattr(e, 'response') and e.response is not None:
                 try:
-                    error_data = e.response.json()
+                    error_data = orjson.loads(e.response.content)
                     error_message = error_data.get('message', str(e))
-                except ValueError:
+                except (orjson.JSONDecodeError, AttributeError):
                     error_message = str(e)
             else:
                 error_message = str(e)
                 
             raise PlanfixAPIError(f"Error communicating with Planfix API: {error_message}")
-        finally:
-            session.close()
+    
+    def _count(self, endpoint: str, filters: List[Dict]) -> int:
+        """
+        Count matching entities on the Planfix side.
+        
+        Args:
+            endpoint: List endpoint to query (e.g. 'task/list')
+            filters: List of Planfix filter definitions
+            
+        Returns:
+            Total number of matching entities
+        """
+        data = {
+            "offset": 0,
+            "pageSize": 1,
+            "fields": "id",
+            "filters": filters
+        }
+        
+        result = self._make_request('POST', endpoint, data=data)
+        if not isinstance(result, dict):
+            logger.error(f"Unexpected response type: {type(result)}")
+            return 0
+        
+        return int(result.get('totalCount', 0))
     
     # Tasks related methods
-    def get_tasks(self, filters: Dict = None, limit: int = 100, offset: int = 0) -> Dict:
+    def get_tasks(self, filters: Dict = None, limit: int = 100, offset: int = 0,
+                  fields: Optional[str] = None) -> Dict:
         """
         Get tasks from Planfix with optional filtering.
         
@@ -114,12 +304,14 @@ class PlanfixAPI:
             filters: Dictionary containing filter parameters
             limit: Maximum number of tasks to return
             offset: Offset for pagination
+            fields: Comma-separated task fields to request (TASK_FIELDS_DEFAULT if omitted)
             
         Returns:
             Dictionary containing tasks data
         """
-        cache_key = f"planfix_tasks_{hash(frozenset({'offset': offset, 'limit': limit}.items()))}"
-        cached_data = cache.get(cache_key)
+        fields = fields or TASK_FIELDS_DEFAULT
+        cache_key = self._cache_key('planfix_tasks', offset, limit, filters, fields)
+        cached_data = self._cache_get(cache_key)
         if cached_data:
             return cached_data
         
@@ -127,14 +319,14 @@ class PlanfixAPI:
         data = {
             "offset": offset,
             "pageSize": limit,
-            "fields": "id,name,status,project,startDateTime,endDateTime,description,assignees,assigner,priority,resultChecking,parent,counterparty,dateTime,hasStartDate,hasEndDate,hasStartTime,hasEndTime,dateOfLastUpdate,duration,durationUnit,durationType,inFavorites,isSummary,isSequential,participants,auditors,isDeleted"
+            "fields": fields
         }
         
         # Если есть дополнительные фильтры, добавляем их
         if filters:
             data.update(filters)
         
-        logger.debug(f"Getting tasks with data: {data}")
+        logger.debug("Getting tasks with data: %s", data)
         result = self._make_request('POST', 'task/list', data=data)
         
         # Проверяем структуру ответа
@@ -169,7 +361,7 @@ class PlanfixAPI:
         result['tasks'] = valid_tasks
         
         # Cache results for 5 minutes
-        cache.set(cache_key, result, 300)
+        self._cache_set(cache_key, result, 300)
         return result
     
     def get_task(self, task_id: Union[str, int]) -> Dict:
@@ -182,16 +374,78 @@ class PlanfixAPI:
         Returns:
             Dictionary containing task data
         """
-        cache_key = f"planfix_task_{task_id}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
+        # Cache results for 5 minutes
+        return self._cached_call(
+            f"planfix_task_{task_id}", 300,
+            lambda: self._make_request('GET', f'tasks/{task_id}')
+        )
+    
+    def get_tasks_by_ids(self, task_ids: List[Union[str, int]]) -> Dict[int, Dict]:
+        """
+        Get several tasks by ID using batched task/list requests.
         
-        result = self._make_request('GET', f'tasks/{task_id}')
+        Args:
+            task_ids: IDs of the tasks to retrieve
+            
+        Returns:
+            Dictionary mapping task ID to task data
+        """
+        tasks = {}
+        missing_ids = []
+        
+        # Serve what we can from the cache
+        for task_id in task_ids:
+            cached_data = self._cache_get(f"planfix_task_list_{task_id}")
+            if cached_data:
+                tasks[int(task_id)] = cached_data
+            else:
+                missing_ids.append(int(task_id))
+        
+        # Fetch the rest in chunks, one request per chunk
+        for i in range(0, len(missing_ids), TASK_BATCH_SIZE):
+            chunk = missing_ids[i:i + TASK_BATCH_SIZE]
+            data = {
+                "offset": 0,
+                "pageSize": len(chunk),
+                "fields": TASK_FIELDS_BATCH,
+                "filters": [
+                    {
+                        "type": "id",
+                        "operator": "in",
+                        "value": chunk
+                    }
+                ]
+            }
+            
+            result = self._make_request('POST', 'task/list', data=data)
+            if not isinstance(result, dict):
+                logger.error(f"Unexpected response type: {type(result)}")
+                continue
+            
+            for task in result.get('tasks', []):
+                if isinstance(task, dict) and 'id' in task:
+                    tasks[int(task['id'])] = task
+                    # Cache results for 5 minutes, apart from get_task(): the
+                    # task/list projection differs from the tasks/{id} response
+                    self._cache_set(f"planfix_task_list_{task['id']}", task, 300)
+        
+        return tasks
+    
+    def map_items(self, fn: Callable[[Union[str, int]], Any], item_ids: List[Union[str, int]]) -> List[Any]:
+        """
+        Call a single-item getter for several IDs concurrently.
         
-        # Cache results for 5 minutes
-        cache.set(cache_key, result, 300)
-        return result
+        For item types without a batch endpoint; the calls run on the
+        instance's worker pool.
+        
+        Args:
+            fn: Getter taking one ID, e.g. self.get_project
+            item_ids: IDs to fetch
+            
+        Returns:
+            Results in the order of item_ids
+        """
+        return list(self._pool.map(fn, item_ids))
     
     def get_task_comments(self, task_id: Union[str, int]) -> List[Dict]:
         """
@@ -203,17 +457,11 @@ class PlanfixAPI:
         Returns:
             List of comments
         """
-        cache_key = f"planfix_task_comments_{task_id}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
-        
-        result = self._make_request('GET', f'tasks/{task_id}/comments')
-        comments = result.get('comments', [])
-        
         # Cache results for 5 minutes
-        cache.set(cache_key, comments, 300)
-        return comments
+        return self._cached_call(
+            f"planfix_task_comments_{task_id}", 300,
+            lambda: self._make_request('GET', f'tasks/{task_id}/comments').get('comments', [])
+        )
     
     def get_task_attachments(self, task_id: Union[str, int]) -> List[Dict]:
         """
@@ -225,17 +473,11 @@ class PlanfixAPI:
         Returns:
             List of attachments
         """
-        cache_key = f"planfix_task_attachments_{task_id}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
-        
-        result = self._make_request('GET', f'tasks/{task_id}/files')
-        attachments = result.get('files', [])
-        
         # Cache results for 5 minutes
-        cache.set(cache_key, attachments, 300)
-        return attachments
+        return self._cached_call(
+            f"planfix_task_attachments_{task_id}", 300,
+            lambda: self._make_request('GET', f'tasks/{task_id}/files').get('files', [])
+        )
     
     def create_task(self, task_data: Dict) -> Dict:
         """
@@ -288,8 +530,8 @@ class PlanfixAPI:
         Returns:
             Dictionary containing projects data
         """
-        cache_key = f"planfix_projects_{hash(frozenset({'offset': offset, 'limit': limit}.items()))}"
-        cached_data = cache.get(cache_key)
+        cache_key = self._cache_key('planfix_projects', offset, limit, filters)
+        cached_data = self._cache_get(cache_key)
         if cached_data:
             return cached_data
         
@@ -311,11 +553,11 @@ class PlanfixAPI:
         if filters:
             data.update(filters)
         
-        logger.debug(f"Getting projects with data: {data}")
+        logger.debug("Getting projects with data: %s", data)
         result = self._make_request('POST', 'project/list', data=data)
         
         # Cache results for 10 minutes
-        cache.set(cache_key, result, 600)
+        self._cache_set(cache_key, result, 600)
         return result
     
     def get_project(self, project_id: Union[str, int]) -> Dict:
@@ -328,16 +570,11 @@ class PlanfixAPI:
         Returns:
             Dictionary containing project data
         """
-        cache_key = f"planfix_project_{project_id}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
-        
-        result = self._make_request('GET', f'projects/{project_id}')
-        
         # Cache results for 10 minutes
-        cache.set(cache_key, result, 600)
-        return result
+        return self._cached_call(
+            f"planfix_project_{project_id}", 600,
+            lambda: self._make_request('GET', f'projects/{project_id}')
+        )
     
     # Employees related methods
     def get_employees(self, filters: Dict = None, limit: int = 100, offset: int = 0) -> Dict:
@@ -352,8 +589,8 @@ class PlanfixAPI:
         Returns:
             Dictionary containing employees data
         """
-        cache_key = f"planfix_employees_{hash(frozenset({'offset': offset, 'limit': limit}.items()))}"
-        cached_data = cache.get(cache_key)
+        cache_key = self._cache_key('planfix_employees', offset, limit, filters)
+        cached_data = self._cache_get(cache_key)
         if cached_data:
             return cached_data
         
@@ -368,11 +605,11 @@ class PlanfixAPI:
         if filters:
             data.update(filters)
         
-        logger.debug(f"Getting employees with data: {data}")
+        logger.debug("Getting employees with data: %s", data)
         result = self._make_request('POST', 'user/list', data=data)
         
         # Cache results for 5 minutes
-        cache.set(cache_key, result, 300)
+        self._cache_set(cache_key, result, 300)
         return result
     
     def get_employee(self, employee_id: Union[str, int]) -> Dict:
@@ -385,16 +622,11 @@ class PlanfixAPI:
         Returns:
             Dictionary containing employee data
         """
-        cache_key = f"planfix_employee_{employee_id}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
-        
-        result = self._make_request('GET', f'users/{employee_id}')
-        
         # Cache results for 1 hour
-        cache.set(cache_key, result, 3600)
-        return result
+        return self._cached_call(
+            f"planfix_employee_{employee_id}", 3600,
+            lambda: self._make_request('GET', f'users/{employee_id}')
+        )
     
     # Status related methods
     def get_task_statuses(self) -> List[Dict]:
@@ -404,17 +636,11 @@ class PlanfixAPI:
         Returns:
             List of task statuses
         """
-        cache_key = "planfix_task_statuses"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
-        
-        result = self._make_request('GET', 'task/statuses')
-        statuses = result.get('statuses', [])
-        
         # Cache results for 1 day (statuses rarely change)
-        cache.set(cache_key, statuses, 86400)
-        return statuses
+        return self._cached_call(
+            "planfix_task_statuses", 86400,
+            lambda: self._make_request('GET', 'task/statuses').get('statuses', [])
+        )
     
     def get_project_statuses(self) -> List[Dict]:
         """
@@ -423,17 +649,11 @@ class PlanfixAPI:
         Returns:
             List of project statuses
         """
-        cache_key = "planfix_project_statuses"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
-        
-        result = self._make_request('GET', 'project/statuses')
-        statuses = result.get('statuses', [])
-        
         # Cache results for 1 day (statuses rarely change)
-        cache.set(cache_key, statuses, 86400)
-        return statuses
+        return self._cached_call(
+            "planfix_project_statuses", 86400,
+            lambda: self._make_request('GET', 'project/statuses').get('statuses', [])
+        )
     
     # Custom fields
     def get_task_custom_fields(self) -> List[Dict]:
@@ -443,17 +663,11 @@ class PlanfixAPI:
         Returns:
             List of task custom fields
         """
-        cache_key = "planfix_task_custom_fields"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
-        
-        result = self._make_request('GET', 'task/fields')
-        fields = result.get('fields', [])
-        
         # Cache results for 1 day (custom fields rarely change)
-        cache.set(cache_key, fields, 86400)
-        return fields
+        return self._cached_call(
+            "planfix_task_custom_fields", 86400,
+            lambda: self._make_request('GET', 'task/fields').get('fields', [])
+        )
     
     def get_project_custom_fields(self) -> List[Dict]:
         """
@@ -462,17 +676,11 @@ class PlanfixAPI:
         Returns:
             List of project custom fields
         """
-        cache_key = "planfix_project_custom_fields"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
-        
-        result = self._make_request('GET', 'project/fields')
-        fields = result.get('fields', [])
-        
         # Cache results for 1 day (custom fields rarely change)
-        cache.set(cache_key, fields, 86400)
-        return fields
+        return self._cached_call(
+            "planfix_project_custom_fields", 86400,
+            lambda: self._make_request('GET', 'project/fields').get('fields', [])
+        )
     
     # Files
     def download_file(self, file_id: Union[str, int]) -> bytes:
@@ -485,118 +693,66 @@ class PlanfixAPI:
         Returns:
             File content as bytes
         """
-        url = f"{self.api_url}/files/{file_id}/download"
-        headers = self._get_headers()
+        url = f"{self._base_url}/files/{file_id}/download"
         
         try:
-            response = requests.get(url, headers=headers)
+            response = self._session.get(url)
             response.raise_for_status()
             return response.content
         except requests.exceptions.RequestException as e:
             logger.error(f"Error downloading file: {str(e)}")
             raise PlanfixAPIError(f"Error downloading file: {str(e)}")
     
+    def download_file_stream(self, file_id: Union[str, int], chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Download a file by ID without holding it in memory.
+        
+        The request is made (and HTTP errors raised) immediately; the body is
+        read lazily while the returned iterator is consumed.
+        
+        Args:
+            file_id: ID of the file to download
+            chunk_size: Size of the yielded chunks in bytes
+            
+        Returns:
+            Iterator over the file content
+        """
+        url = f"{self._base_url}/files/{file_id}/download"
+        
+        try:
+            response = self._session.get(url, stream=True)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error downloading file: {str(e)}")
+            raise PlanfixAPIError(f"Error downloading file: {str(e)}")
+        
+        return self._iter_response(response, chunk_size)
+    
+    @staticmethod
+    def _iter_response(response: requests.Response, chunk_size: int) -> Iterator[bytes]:
+        """Yield a streamed response body, releasing the connection at the end."""
+        try:
+            yield from response.iter_content(chunk_size)
+        finally:
+            response.close()
+    
     # Helper methods for data synchronization
     def sync_all_data(self) -> Dict:
         """
         Synchronize all data from Planfix.
         
+        Comments and attachments are fetched concurrently by AsyncPlanfixAPI;
+        this method is a blocking bridge for synchronous callers.
+        
         Returns:
             Dictionary with statistics about synchronized data
         """
-        stats = {
-            'tasks': 0,
-            'projects': 0,
-            'employees': 0,
-            'comments': 0,
-            'attachments': 0,
-            'errors': []
-        }
-        
-        try:
-            # Sync projects
-            projects_data = self.get_projects(limit=500)
-            logger.debug(f"Projects data: {projects_data}")
-            projects = projects_data.get('projects', [])
-            stats['projects'] = len(projects)
-            
-            # Sync employees
-            employees_data = self.get_employees(limit=500)
-            logger.debug(f"Employees data: {employees_data}")
-            employees = employees_data.get('users', [])
-            stats['employees'] = len(employees)
-            
-            # Sync tasks (paginated)
-            offset = 0
-            limit = 100
-            while True:
-                tasks_data = self.get_tasks(limit=limit, offset=offset)
-                logger.debug(f"Tasks data: {tasks_data}")
-                
-                # Проверяем структуру ответа
-                if not isinstance(tasks_data, dict):
-                    logger.error(f"Unexpected tasks data type: {type(tasks_data)}")
-                    stats['errors'].append(f"Unexpected tasks data type: {type(tasks_data)}")
-                    break
-                
-                tasks = tasks_data.get('tasks', [])
-                if not tasks:
-                    break
-                
-                logger.debug(f"Processing {len(tasks)} tasks (offset: {offset})")
-                stats['tasks'] += len(tasks)
-                
-                # For each task, sync comments and attachments
-                for i, task in enumerate(tasks):
-                    try:
-                        # Проверяем, что task это словарь
-                        if not isinstance(task, dict):
-                            logger.error(f"Task {i} is not a dictionary: {task}")
-                            continue
-                            
-                        # Логируем структуру задачи для отладки
-                        logger.debug(f"Task {i} structure: {task}")
-                        
-                        task_id = task.get('id')
-                        if not task_id:
-                            logger.error(f"Task {i} has no ID: {task}")
-                            continue
-                        
-                        # Sync comments
-                        try:
-                            comments = self.get_task_comments(task_id)
-                            stats['comments'] += len(comments)
-                        except Exception as e:
-                            logger.error(f"Error getting comments for task {task_id}: {str(e)}")
-                            stats['errors'].append(f"Error getting comments for task {task_id}: {str(e)}")
-                        
-                        # Sync attachments
-                        try:
-                            attachments = self.get_task_attachments(task_id)
-                            stats['attachments'] += len(attachments)
-                        except Exception as e:
-                            logger.error(f"Error getting attachments for task {task_id}: {str(e)}")
-                            stats['errors'].append(f"Error getting attachments for task {task_id}: {str(e)}")
-                            
-                    except Exception as e:
-                        logger.error(f"Error processing task {i}: {str(e)}")
-                        stats['errors'].append(f"Error processing task {i}: {str(e)}")
-                
-                offset += limit
-                
-                # Safety check to prevent infinite loops
-                if offset > 5000:  # Limit to 5000 tasks
-                    break
-            
-            return stats
-        except PlanfixAPIError as e:
-            logger.error(f"Error during data synchronization: {str(e)}")
-            stats['errors'].append(str(e))
-            return stats
-        except Exception as e:
-            logger.error(f"Unexpected error during synchronization: {str(e)}")
-            stats['errors'].append(f"Unexpected error: {str(e)}")
-            return stats
+        return asyncio.run(self._sync_all_data_async())
+    
+    async def _sync_all_data_async(self) -> Dict:
+        """Run the asynchronous synchronization with a short-lived client."""
+        async with AsyncPlanfixAPI(self) as async_api:
+            return await async_api.sync_all_data()
             
     def get_tasks_due_soon(self, days: int = 7, limit: int = 10) -> List[Dict]:
         """
@@ -636,7 +792,11 @@ class PlanfixAPI:
         Returns:
             Dictionary with recent tasks and comments
         """
-        past_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%dT00:00:00')
+        cutoff = datetime.now() - timedelta(days=days)
+        past_date = cutoff.strftime('%Y-%m-%dT00:00:00')
+        
+        # ISO-8601 strings in the same format compare correctly as plain strings
+        cutoff_str = cutoff.strftime('%Y-%m-%dT%H:%M:%S')
         
         # Get recently updated tasks
         task_filters = {
@@ -655,21 +815,18 @@ class PlanfixAPI:
             
             # Filter comments by date
             for comment in comments:
-                comment_date_str = comment.get('createDateTime')
-                if comment_date_str:
-                    comment_date = datetime.fromisoformat(comment_date_str.replace('Z', '+00:00'))
-                    if comment_date > datetime.now() - timedelta(days=days):
-                        # Add task info to comment for context
-                        comment['task'] = {
-                            'id': task_id,
-                            'title': task.get('title')
-                        }
-                        recent_comments.append(comment)
+                if (comment.get('createDateTime') or '') > cutoff_str:
+                    # Add task info to a copy of the comment for context;
+                    # the original is shared through the response memo
+                    recent_comments.append(dict(comment, task={
+                        'id': task_id,
+                        'title': task.get('title')
+                    }))
         
         # Sort comments by date (newest first)
         recent_comments = sorted(
             recent_comments, 
-            key=lambda x: x.get('createDateTime', ''), 
+            key=itemgetter('createDateTime'), 
             reverse=True
         )[:limit]
         
@@ -710,46 +867,39 @@ class PlanfixAPI:
         Returns:
             Dictionary with user statistics
         """
-        # Get tasks assigned to the user
-        all_tasks = self.get_my_tasks(user_id, limit=1000)
-        
-        # Calculate statistics
-        total_tasks = len(all_tasks)
-        overdue_tasks = 0
-        due_soon_tasks = 0
-        no_deadline_tasks = 0
-        
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        for task in all_tasks:
-            deadline_str = task.get('deadline')
-            if deadline_str:
-                deadline = datetime.fromisoformat(deadline_str.replace('Z', '+00:00'))
-                if deadline < today:
-                    overdue_tasks += 1
-                elif deadline < today + timedelta(days=7):
-                    due_soon_tasks += 1
-            else:
-                no_deadline_tasks += 1
+        # Let Planfix count matching tasks instead of transferring them
+        today = datetime.now()
+        today_str = today.strftime('%Y-%m-%dT00:00:00')
+        week_str = (today + timedelta(days=7)).strftime('%Y-%m-%dT00:00:00')
+        
+        assigned_filters = [
+            {"type": "assignees", "operator": "equal", "value": user_id},
+            {"type": "status", "operator": "equal", "value": "not_done"}
+        ]
+        
+        total_tasks = self._count('task/list', assigned_filters)
+        overdue_tasks = self._count('task/list', assigned_filters + [
+            {"type": "deadline", "operator": "less", "value": today_str}
+        ])
+        due_soon_tasks = self._count('task/list', assigned_filters + [
+            {"type": "deadline", "operator": "gtequal", "value": today_str},
+            {"type": "deadline", "operator": "less", "value": week_str}
+        ])
+        no_deadline_tasks = self._count('task/list', assigned_filters + [
+            {"type": "deadline", "operator": "equal", "value": ""}
+        ])
         
         # Get projects where user is responsible
-        projects_data = self.get_projects(limit=1000)
-        projects = projects_data.get('projects', [])
-        
-        responsible_projects = []
-        for project in projects:
-            responsible_persons = project.get('responsibleEmployees', [])
-            for person in responsible_persons:
-                if str(person.get('id')) == str(user_id):
-                    responsible_projects.append(project)
-                    break
+        responsible_projects = self._count('project/list', [
+            {"type": "responsibleEmployees", "operator": "equal", "value": user_id}
+        ])
         
         return {
             'total_tasks': total_tasks,
             'overdue_tasks': overdue_tasks,
             'due_soon_tasks': due_soon_tasks,
             'no_deadline_tasks': no_deadline_tasks,
-            'responsible_projects': len(responsible_projects)
+            'responsible_projects': responsible_projects
         }
     
     def search(self, query: str, entity_type: str = None, limit: int = 20) -> Dict:
@@ -816,4 +966,216 @@ class PlanfixAPI:
             employees_data = self.get_employees(filters=employee_filters)
             results['employees'] = employees_data.get('users', [])
         
-        return results
\ No newline at end of file
+        return results
+
+
+
+_planfix_api = None
+_planfix_api_lock = threading.Lock()
+
+
+def get_planfix_api() -> PlanfixAPI:
+    """
+    Get the process-wide PlanfixAPI client, creating it on first use.
+    
+    Sharing the instance keeps its HTTP connection pool and worker threads
+    alive between requests. Every call gives the calling thread a fresh
+    local response memo, so each request still starts from the Django cache.
+    """
+    global _planfix_api
+    
+    if _planfix_api is None:
+        with _planfix_api_lock:
+            if _planfix_api is None:
+                _planfix_api = PlanfixAPI()
+                return _planfix_api
+    
+    _planfix_api.clear_local()
+    return _planfix_api
+
+class AsyncPlanfixAPI:
+    """Asynchronous Planfix client for I/O-bound fan-out operations."""
+    
+    def __init__(self, api: PlanfixAPI = None, max_concurrency: int = 32):
+        # Reuse configuration and caches of a regular PlanfixAPI instance
+        self.api = api or PlanfixAPI()
+        self.max_concurrency = max_concurrency
+        self._client = httpx.AsyncClient(
+            http2=True,
+            base_url=self.api._base_url,
+            headers=self.api._headers,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=httpx.Timeout(10.0, connect=3.0)
+        )
+    
+    async def __aenter__(self) -> 'AsyncPlanfixAPI':
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self._client.aclose()
+    
+    def _run_in_pool(self, fn: Callable, *args, **kwargs) -> 'asyncio.Future':
+        """Run a blocking PlanfixAPI call on the wrapped instance's worker pool."""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self.api._pool, functools.partial(fn, *args, **kwargs))
+    
+    async def _make_request(self, method: str, endpoint: str, data: Dict = None) -> Dict:
+        """Make an asynchronous request to the Planfix API."""
+        try:
+            response = await self._client.request(
+                method,
+                endpoint,
+                content=orjson.dumps(data) if data else None
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"Planfix API error: {str(e)}")
+            raise PlanfixAPIError(f"Error communicating with Planfix API: {str(e)}")
+        
+        if not response.content:
+            logger.error("Empty response received")
+            raise PlanfixAPIError("Empty response received from Planfix API")
+        
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON response: {str(e)}")
+            raise PlanfixAPIError(f"Invalid JSON response from Planfix API: {str(e)}")
+    
+    async def _cached_list(self, cache_key: str, endpoint: str, field: str, timeout: int) -> List[Dict]:
+        """Get a list field of a GET endpoint, going through the shared caches."""
+        # The Django cache is blocking (a Redis round-trip in production), so
+        # it is accessed from the worker pool to keep the event loop free
+        cached_data = await self._run_in_pool(self.api._cache_get, cache_key)
+        if cached_data:
+            return cached_data
+        
+        result = await self._make_request('GET', endpoint)
+        items = result.get(field, [])
+        await self._run_in_pool(self.api._cache_set, cache_key, items, timeout)
+        return items
+    
+    async def get_task_comments(self, task_id: Union[str, int]) -> List[Dict]:
+        """
+        Get comments for a specific task.
+        
+        Args:
+            task_id: ID of the task
+            
+        Returns:
+            List of comments
+        """
+        # Cache results for 5 minutes
+        return await self._cached_list(
+            f"planfix_task_comments_{task_id}", f'tasks/{task_id}/comments', 'comments', 300
+        )
+    
+    async def get_task_attachments(self, task_id: Union[str, int]) -> List[Dict]:
+        """
+        Get attachments for a specific task.
+        
+        Args:
+            task_id: ID of the task
+            
+        Returns:
+            List of attachments
+        """
+        # Cache results for 5 minutes
+        return await self._cached_list(
+            f"planfix_task_attachments_{task_id}", f'tasks/{task_id}/files', 'files', 300
+        )
+    
+    async def sync_all_data(self, page_size: int = 100, max_tasks: int = 5000) -> Dict:
+        """
+        Synchronize all data from Planfix.
+        
+        Task pages are still read through the synchronous client (in a worker
+        thread, one page ahead), while comments and attachments of every page
+        are fetched concurrently, bounded by max_concurrency.
+        
+        Args:
+            page_size: Number of tasks to request per page
+            max_tasks: Safety limit for the number of processed tasks
+            
+        Returns:
+            Dictionary with statistics about synchronized data
+        """
+        stats = {
+            'tasks': 0,
+            'projects': 0,
+            'employees': 0,
+            'comments': 0,
+            'attachments': 0,
+            'errors': []
+        }
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def fetch(kind: str, task_id: Union[str, int]) -> None:
+            async with semaphore:
+                try:
+                    if kind == 'comments':
+                        items = await self.get_task_comments(task_id)
+                    else:
+                        items = await self.get_task_attachments(task_id)
+                    stats[kind] += len(items)
+                except Exception as e:
+                    logger.error(f"Error getting {kind} for task {task_id}: {str(e)}")
+                    stats['errors'].append(f"Error getting {kind} for task {task_id}: {str(e)}")
+        
+        self.api.clear_local()
+        
+        try:
+            # Sync projects and employees
+            projects_data, employees_data = await asyncio.gather(
+                self._run_in_pool(self.api.get_projects, limit=500),
+                self._run_in_pool(self.api.get_employees, limit=500)
+            )
+            logger.debug("Projects data: %s", projects_data)
+            logger.debug("Employees data: %s", employees_data)
+            stats['projects'] = len(projects_data.get('projects', []))
+            stats['employees'] = len(employees_data.get('users', []))
+            
+            # Sync tasks (the next page is fetched while the current one is processed)
+            offset = 0
+            next_page = asyncio.create_task(
+                self._run_in_pool(self.api.get_tasks, limit=page_size, offset=offset, fields='id')
+            )
+            while next_page is not None:
+                tasks = (await next_page).get('tasks', [])
+                if not tasks:
+                    break
+                
+                offset += page_size
+                next_page = None
+                if len(tasks) == page_size and stats['tasks'] + len(tasks) < max_tasks:
+                    next_page = asyncio.create_task(
+                        self._run_in_pool(self.api.get_tasks, limit=page_size, offset=offset, fields='id')
+                    )
+                
+                stats['tasks'] += len(tasks)
+                
+                jobs = []
+                for i, task in enumerate(tasks):
+                    task_id = task.get('id')
+                    if not task_id:
+                        logger.error(f"Task {i} has no ID: {task}")
+                        continue
+                    jobs.append(fetch('comments', task_id))
+                    jobs.append(fetch('attachments', task_id))
+                await asyncio.gather(*jobs)
+                
+                # Bound memory used by the local memo between pages
+                self.api.clear_local()
+            
+            return stats
+        except PlanfixAPIError as e:
+            logger.error(f"Error during data synchronization: {str(e)}")
+            stats['errors'].append(str(e))
+            return stats
+        except Exception as e:
+            logger.error(f"Unexpected error during synchronization: {str(e)}")
+            stats['errors'].append(f"Unexpected error: {str(e)}")
+            return stats
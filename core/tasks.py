@@ -0,0 +1,26 @@
+import logging
+
+from celery import shared_task
+from django.core.management import call_command
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def run_sync_planfix_data(command_args=None):
+    """Run the sync_planfix_data management command in a worker."""
+    try:
+        call_command('sync_planfix_data', *(command_args or []))
+    except Exception as e:
+        logger.error(f"Error during async data sync: {str(e)}")
+        raise
+
+
+@shared_task
+def run_update_vector_db(command_args=None):
+    """Run the update_vector_db management command in a worker."""
+    try:
+        call_command('update_vector_db', *(command_args or []))
+    except Exception as e:
+        logger.error(f"Error during async vector update: {str(e)}")
+        raise
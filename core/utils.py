@@ -1 +1,231 @@
-# Utility functions will go here
\ No newline at end of file
+import functools
+import hashlib
+import logging
+import os
+import threading
+
+import orjson
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+# Cache key and lifetime of the dashboard statistics
+DASHBOARD_STATS_CACHE_KEY = 'dashboard_stats_v1'
+DASHBOARD_STATS_TIMEOUT = 60
+
+# Cache key and lifetime of the VectorDBMetadata row
+VECTOR_DB_METADATA_CACHE_KEY = 'vector_db_metadata'
+VECTOR_DB_METADATA_TIMEOUT = 30
+
+# Cached filter dropdown choices of the list views, by the model they come from
+FILTER_CHOICES_TIMEOUT = 300
+FILTER_CHOICES_CACHE_KEYS = {
+    'core.Task': ('filter_task_statuses',),
+    'core.Project': ('filter_project_statuses', 'filter_projects'),
+    'core.User': ('filter_users',),
+}
+
+# How long paginator COUNT(*) results are reused, and the table size above
+# which unfiltered lists use the PostgreSQL planner estimate instead
+PAGINATOR_COUNT_TIMEOUT = 30
+PAGINATOR_ESTIMATE_THRESHOLD = 100000
+
+# Per-thread buffer of pending LogEntry rows; None outside a buffered request
+_log_buffer = threading.local()
+
+
+def start_log_buffer():
+    """Start collecting log_event() calls for the current thread."""
+    _log_buffer.entries = []
+
+
+def flush_log_buffer():
+    """
+    Write the collected log entries with a single bulk insert.
+
+    Returns:
+        Number of entries written
+    """
+    entries = getattr(_log_buffer, 'entries', None)
+    _log_buffer.entries = None
+
+    if not entries:
+        return 0
+
+    from core.models import LogEntry
+
+    try:
+        LogEntry.objects.bulk_create(entries)
+    except Exception as e:
+        logger.error(f"Error writing {len(entries)} log entries: {str(e)}")
+        return 0
+
+    return len(entries)
+
+
+def log_event(message, level='INFO', source='system', user=None, metadata=None, request=None):
+    """
+    Record a LogEntry.
+
+    Inside a request handled by LogEntryBufferMiddleware the entry is buffered
+    and written after the response has been sent; otherwise it is saved
+    immediately.
+
+    Args:
+        message: Log message
+        level: Log level (INFO, WARNING, ERROR, DEBUG)
+        source: Event source, e.g. 'auth' or 'chat'
+        user: Optional user the event belongs to
+        metadata: Optional extra data stored with the entry
+        request: Optional request; its IP and user agent are added to metadata
+
+    Returns:
+        The (possibly unsaved) LogEntry
+    """
+    from core.models import LogEntry
+
+    metadata = dict(metadata or {})
+    if request is not None:
+        metadata.setdefault('ip', request.META.get('REMOTE_ADDR'))
+        metadata.setdefault('user_agent', request.META.get('HTTP_USER_AGENT', ''))
+
+    entry = LogEntry(
+        user=user,
+        level=level,
+        source=source,
+        message=message,
+        metadata=metadata
+    )
+
+    entries = getattr(_log_buffer, 'entries', None)
+    if entries is not None:
+        entries.append(entry)
+    else:
+        entry.save()
+
+    return entry
+
+
+@functools.lru_cache(maxsize=None)
+def ensure_dir(path):
+    """
+    Create a directory if it doesn't exist yet.
+
+    Cached per path, and an existing directory is detected with a stat
+    instead of a failing mkdir.
+
+    Args:
+        path: Directory path
+    """
+    if not os.path.isdir(path):
+        os.makedirs(path, exist_ok=True)
+
+
+def ojson_response(data, status=200, option=None):
+    """
+    Build a JSON response serialized with orjson.
+
+    Args:
+        data: Data to serialize
+        status: HTTP status code
+        option: Optional orjson option flags, e.g. orjson.OPT_SERIALIZE_NUMPY
+
+    Returns:
+        HttpResponse with an application/json body
+    """
+    return HttpResponse(
+        orjson.dumps(data, option=option),
+        content_type='application/json',
+        status=status
+    )
+
+
+def invalidate_dashboard_stats(sender, **kwargs):
+    """post_save/post_delete receiver dropping the cached dashboard statistics."""
+    cache.delete(DASHBOARD_STATS_CACHE_KEY)
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that avoids running COUNT(*) on every page request.
+
+    Unfiltered querysets on large PostgreSQL tables use the planner's row
+    estimate from pg_class; everything else caches the exact count for
+    PAGINATOR_COUNT_TIMEOUT seconds, keyed on the SQL and its parameters.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return super().count
+
+        estimate = self._estimated_count(queryset)
+        if estimate is not None:
+            return estimate
+
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            # e.g. queryset.none()
+            return 0
+        digest = hashlib.blake2b(f'{sql}|{params!r}'.encode(), digest_size=16).hexdigest()
+        key = f'paginator_count:{queryset.db}:{digest}'
+
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, PAGINATOR_COUNT_TIMEOUT)
+        return count
+
+    @staticmethod
+    def _estimated_count(queryset):
+        """Row estimate for an unfiltered PostgreSQL table, or None."""
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql' or queryset.query.where or queryset.query.distinct:
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+
+        # Small or never analyzed tables (reltuples <= 0) get an exact count
+        if not row or row[0] < PAGINATOR_ESTIMATE_THRESHOLD:
+            return None
+        return row[0]
+
+
+def invalidate_filter_choices(sender, **kwargs):
+    """post_save/post_delete receiver dropping the cached filter choices of a model."""
+    cache.delete_many(FILTER_CHOICES_CACHE_KEYS.get(sender._meta.label, ()))
+
+
+def get_vector_db_metadata():
+    """
+    Get the VectorDBMetadata row, cached for VECTOR_DB_METADATA_TIMEOUT seconds.
+
+    Returns:
+        VectorDBMetadata instance, or None if the vector database was never indexed
+    """
+    from core.models import VectorDBMetadata
+
+    metadata = cache.get(VECTOR_DB_METADATA_CACHE_KEY, False)
+    if metadata is False:
+        metadata = VectorDBMetadata.objects.first()
+        # None is cached too, so an uninitialized database isn't queried every time
+        cache.set(VECTOR_DB_METADATA_CACHE_KEY, metadata, VECTOR_DB_METADATA_TIMEOUT)
+    return metadata
+
+
+def invalidate_vector_db_metadata(sender, **kwargs):
+    """post_save/post_delete receiver dropping the cached VectorDBMetadata row."""
+    cache.delete(VECTOR_DB_METADATA_CACHE_KEY)
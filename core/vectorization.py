@@ -1,9 +1,18 @@
 import os
 import json
+import time
+import atexit
+import hashlib
 import logging
+import threading
 import numpy as np
 import faiss
+import orjson
+import torch
+import zstandard
 import pickle
+import sqlite3
+from collections import Counter, OrderedDict
 from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional, Union
 from sentence_transformers import SentenceTransformer
@@ -15,6 +24,34 @@ from django.db.models import Q
 
 logger = logging.getLogger(__name__)
 
+# Use every core for CPU inference; this must run before the first
+# SentenceTransformer is created. Inter-op parallelism only adds contention
+# for a single encoder, so it is pinned to one thread.
+torch.set_num_threads(getattr(settings, 'TORCH_NUM_THREADS', os.cpu_count() or 4))
+try:
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    # Already fixed once torch has started parallel work
+    pass
+
+# Texts encoded per forward pass during bulk vectorization
+EMBEDDING_BATCH_SIZE = 64
+
+# Rows streamed from the database and vectorized together in bulk ingest
+VECTORIZE_CHUNK_SIZE = 500
+
+# Single-text embeddings kept in the per-instance LRU cache
+EMBEDDING_CACHE_SIZE = 4096
+
+# Below this many vectors, copying the index to the GPU costs more than it saves
+GPU_MIN_VECTORS = 50000
+
+# Changes made within this window are persisted by a single background save
+SAVE_DEBOUNCE_SECONDS = 5
+
+# Leading bytes of a zstd frame, used to detect compressed index files
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
 
 class VectorizationError(Exception):
     """Custom exception for vectorization errors."""
@@ -24,17 +61,53 @@ class VectorizationError(Exception):
 class Vectorizer:
     """Class to handle vectorization of Planfix data."""
     
-    def __init__(self):
+    def __init__(self, read_only: bool = False):
+        # Read-only instances (search and status views) memory-map the index
+        self.read_only = read_only
         self.vector_db_type = getattr(settings, 'VECTOR_DB_TYPE', 'FAISS')
         self.vector_db_path = getattr(settings, 'VECTOR_DB_PATH', './vector_db')
         self.model_name = getattr(settings, 'EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
+        self.embedding_backend = getattr(settings, 'EMBEDDING_BACKEND', 'torch')
+        self.onnx_file = getattr(settings, 'EMBEDDING_ONNX_FILE', '')
+        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self._gpu_resources = None
+        self.index_factory = getattr(settings, 'FAISS_INDEX_FACTORY', 'IVF256,PQ32x8')
+        self.ivf_threshold = getattr(settings, 'FAISS_IVF_THRESHOLD', 10000)
+        self.nprobe = getattr(settings, 'FAISS_NPROBE', 16)
+        self.compress_index = getattr(settings, 'FAISS_COMPRESS_INDEX', False)
+        
+        # LRU cache of single-text embeddings, keyed by a digest of the text
+        self._embedding_cache = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
+        
+        # Set during bulk ingest to skip the periodic save in _add_vector_faiss
+        self._bulk_mode = False
+        
+        # SQLite metadata store, opened by _initialize_faiss
+        self._meta_db = None
+        self._meta_lock = threading.Lock()
+        
+        # Vectors per metadata type, kept up to date on add/delete for stats
+        self._type_counts = Counter()
+        
+        # Guards index mutation against the background saver serializing it
+        self._index_lock = threading.RLock()
+        # Serializes whole saves (held during the disk write)
+        self._save_lock = threading.Lock()
+        # Only guards starting the saver thread, so scheduling never waits on a save
+        self._save_thread_lock = threading.Lock()
+        self._save_pending = threading.Event()
+        self._save_thread = None
+        
+        # Modification time of the index file this instance last loaded or saved
+        self._index_mtime = None
         
         # Create vector_db directory if it doesn't exist
         Path(self.vector_db_path).mkdir(parents=True, exist_ok=True)
         
         # Load embedding model
         try:
-            self.model = SentenceTransformer(self.model_name)
+            self.model = self._load_model()
             self.vector_dim = self.model.get_sentence_embedding_dimension()
             logger.info(f"Loaded embedding model {self.model_name} with dimension {self.vector_dim}")
         except Exception as e:
@@ -44,6 +117,27 @@ class Vectorizer:
         # Initialize vector database
         self._initialize_vector_database()
     
+    def _load_model(self) -> SentenceTransformer:
+        """
+        Load the embedding model.
+        
+        With EMBEDDING_BACKEND='onnx' the model runs under ONNX Runtime, using
+        the quantized weights named by EMBEDDING_ONNX_FILE when set. Any
+        failure (e.g. optimum/onnxruntime not installed) falls back to PyTorch.
+        """
+        if self.embedding_backend == 'onnx':
+            try:
+                model_kwargs = {'file_name': self.onnx_file} if self.onnx_file else None
+                model = SentenceTransformer(
+                    self.model_name, device=self.device, backend='onnx', model_kwargs=model_kwargs
+                )
+                logger.info(f"Using ONNX Runtime backend for {self.model_name}")
+                return model
+            except Exception as e:
+                logger.warning(f"Could not load ONNX backend, falling back to PyTorch: {str(e)}")
+        
+        return SentenceTransformer(self.model_name, device=self.device)
+    
     def _initialize_vector_database(self) -> None:
         """Initialize the vector database."""
         if self.vector_db_type == 'FAISS':
@@ -55,14 +149,29 @@ class Vectorizer:
         """Initialize FAISS vector database."""
         # Check if index exists
         index_path = os.path.join(self.vector_db_path, 'faiss_index.bin')
-        metadata_path = os.path.join(self.vector_db_path, 'metadata.pkl')
+        metadata_path = os.path.join(self.vector_db_path, 'metadata.sqlite')
+        legacy_metadata_path = os.path.join(self.vector_db_path, 'metadata.pkl')
+        
+        has_metadata = os.path.exists(metadata_path)
+        has_legacy_metadata = os.path.exists(legacy_metadata_path)
         
-        if os.path.exists(index_path) and os.path.exists(metadata_path):
+        self._open_metadata_db(metadata_path)
+        
+        if os.path.exists(index_path) and (has_metadata or has_legacy_metadata):
             # Load existing index and metadata
             try:
-                self.index = faiss.read_index(index_path)
-                with open(metadata_path, 'rb') as f:
-                    self.metadata = pickle.load(f)
+                self.index = self._read_index(index_path)
+                if has_metadata:
+                    self._load_metadata_info()
+                    self._wrap_legacy_index()
+                else:
+                    self._import_legacy_metadata(legacy_metadata_path)
+                    self._wrap_legacy_index()
+                    # The on-disk index belongs to writers (update_vector_db)
+                    if not self.read_only:
+                        self._save_faiss_index()
+                self._move_index_to_gpu()
+                self._index_mtime = os.path.getmtime(index_path)
                 logger.info(f"Loaded existing FAISS index with {self.index.ntotal} vectors")
             except Exception as e:
                 logger.error(f"Error loading existing FAISS index: {str(e)}")
@@ -72,18 +181,35 @@ class Vectorizer:
             self._create_new_faiss_index()
     
     def _create_new_faiss_index(self) -> None:
-        """Create a new FAISS index."""
+        """
+        Create a new FAISS index.
+        
+        Read-only instances only get an empty in-memory index; the metadata
+        store and the index file on disk are left for update_vector_db.
+        """
         try:
-            # Create a new FAISS index
-            self.index = faiss.IndexFlatL2(self.vector_dim)
+            # Start with an exact flat index; it is swapped for IVF-PQ once
+            # there are enough vectors to train it (see _upgrade_to_ivf_index).
+            # IndexIDMap2 keeps our own vector IDs so deletes can use remove_ids.
+            # Embeddings are L2-normalized, so inner product is cosine similarity
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.vector_dim))
             
             # Initialize metadata
+            now_iso = timezone.now().isoformat()
             self.metadata = {
-                'vectors': [],
-                'created_at': timezone.now().isoformat(),
-                'updated_at': timezone.now().isoformat(),
+                'created_at': now_iso,
+                'updated_at': now_iso,
                 'count': 0
             }
+            self._type_counts = Counter()
+            
+            if self.read_only:
+                logger.warning("No usable FAISS index found; searching an empty index until it is built")
+                return
+            
+            with self._meta_lock:
+                self._meta_db.execute("DELETE FROM vector_meta")
+                self._meta_db.commit()
             
             logger.info("Created new FAISS index")
             
@@ -106,104 +232,412 @@ class Vectorizer:
             logger.error(f"Error creating new FAISS index: {str(e)}")
             raise VectorizationError(f"Error creating new FAISS index: {str(e)}")
     
+    def _read_index(self, index_path: str):
+        """
+        Read the FAISS index from disk.
+        
+        Read-only instances memory-map the file so the kernel pages vectors in
+        on demand instead of copying the whole index into RAM. Writable
+        instances load it fully, since mmapped IVF lists cannot be appended to.
+        Compressed (zstd) index files are always decompressed into memory.
+        """
+        with open(index_path, 'rb') as f:
+            if f.read(4) == ZSTD_MAGIC:
+                f.seek(0)
+                data = zstandard.ZstdDecompressor().decompress(f.read())
+                return faiss.deserialize_index(np.frombuffer(data, dtype=np.uint8))
+        
+        if self.read_only:
+            try:
+                return faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            except RuntimeError as e:
+                logger.warning(f"Could not memory-map FAISS index, loading it fully: {str(e)}")
+        
+        return faiss.read_index(index_path)
+    
+    def refresh(self) -> None:
+        """Reload the index if another process has saved a newer one since it was loaded."""
+        index_path = os.path.join(self.vector_db_path, 'faiss_index.bin')
+        try:
+            mtime = os.path.getmtime(index_path)
+        except OSError:
+            return
+        
+        if mtime == self._index_mtime:
+            return
+        
+        try:
+            with self._index_lock:
+                self._gpu_resources = None
+                self.index = self._read_index(index_path)
+                self._load_metadata_info()
+                self._move_index_to_gpu()
+                self._index_mtime = mtime
+            logger.info(f"Reloaded FAISS index with {self.index.ntotal} vectors")
+        except Exception as e:
+            logger.error(f"Error reloading FAISS index: {str(e)}")
+            raise VectorizationError(f"Error reloading FAISS index: {str(e)}")
+    
+    def _move_index_to_gpu(self) -> None:
+        """
+        Copy the index to the GPU for read-only instances when one is available.
+        
+        Writable instances stay on the CPU because GPU indexes do not support
+        remove_ids, and small indexes are not worth the transfer.
+        """
+        if not self.read_only or self.index.ntotal < GPU_MIN_VECTORS:
+            return
+        if not hasattr(faiss, 'StandardGpuResources') or faiss.get_num_gpus() == 0:
+            return
+        
+        try:
+            # nprobe is copied over by the cloner
+            ivf_index = faiss.try_extract_index_ivf(self.index)
+            if ivf_index is not None:
+                ivf_index.nprobe = self.nprobe
+            
+            self._gpu_resources = faiss.StandardGpuResources()
+            self.index = faiss.index_cpu_to_gpu(self._gpu_resources, 0, self.index)
+            logger.info(f"Moved FAISS index with {self.index.ntotal} vectors to GPU")
+        except Exception as e:
+            self._gpu_resources = None
+            logger.warning(f"Could not move FAISS index to GPU: {str(e)}")
+    
+    def _open_metadata_db(self, metadata_path: str) -> None:
+        """Open the SQLite metadata store, creating its tables if needed."""
+        self._meta_db = sqlite3.connect(metadata_path, check_same_thread=False)
+        self._meta_db.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL only fsyncs at checkpoints and stays corruption-safe
+        self._meta_db.execute("PRAGMA synchronous=NORMAL")
+        self._meta_db.execute(
+            "CREATE TABLE IF NOT EXISTS vector_meta ("
+            "id INTEGER PRIMARY KEY, text TEXT, metadata TEXT, created_at TEXT)"
+        )
+        self._meta_db.execute(
+            "CREATE TABLE IF NOT EXISTS vector_info (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        # Expression index backing type-filtered search and type counts
+        self._meta_db.execute(
+            "CREATE INDEX IF NOT EXISTS vector_meta_type ON vector_meta (json_extract(metadata, '$.type'))"
+        )
+        self._meta_db.commit()
+    
+    def _load_metadata_info(self) -> None:
+        """Load index-level metadata (timestamps, next ID) from SQLite."""
+        with self._meta_lock:
+            rows = self._meta_db.execute("SELECT key, value FROM vector_info").fetchall()
+        self.metadata = {key: orjson.loads(value) for key, value in rows}
+        if 'count' not in self.metadata:
+            raise VectorizationError("Vector metadata store is missing index info")
+        self._count_types()
+    
+    def _count_types(self) -> None:
+        """Seed the per-type vector counters from the metadata store."""
+        with self._meta_lock:
+            rows = self._meta_db.execute(
+                "SELECT json_extract(metadata, '$.type'), count(*) FROM vector_meta GROUP BY 1"
+            ).fetchall()
+        self._type_counts = Counter(dict(rows))
+    
+    def _import_legacy_metadata(self, legacy_metadata_path: str) -> None:
+        """Import a metadata.pkl file written by older versions into SQLite."""
+        with open(legacy_metadata_path, 'rb') as f:
+            legacy = pickle.load(f)
+        
+        with self._meta_lock:
+            self._meta_db.executemany(
+                "INSERT OR REPLACE INTO vector_meta VALUES (?, ?, ?, ?)",
+                (
+                    (item['id'], item['text'], orjson.dumps(item['metadata']).decode(), item.get('created_at'))
+                    for item in legacy['vectors']
+                )
+            )
+            self._meta_db.commit()
+        
+        self.metadata = {
+            'created_at': legacy.get('created_at'),
+            'updated_at': legacy.get('updated_at'),
+            'count': legacy['count']
+        }
+        self._count_types()
+        logger.info(f"Imported {len(legacy['vectors'])} vector metadata entries from {legacy_metadata_path}")
+    
+    def _fetch_metadata(self, vector_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Fetch metadata entries for the given vector IDs.
+        
+        Args:
+            vector_ids: Vector IDs to look up
+            
+        Returns:
+            Dictionary mapping vector ID to its metadata entry
+        """
+        if not vector_ids:
+            return {}
+        
+        placeholders = ','.join('?' * len(vector_ids))
+        with self._meta_lock:
+            rows = self._meta_db.execute(
+                f"SELECT id, text, metadata, created_at FROM vector_meta WHERE id IN ({placeholders})",
+                vector_ids
+            ).fetchall()
+        
+        return {
+            row[0]: {'id': row[0], 'text': row[1], 'metadata': orjson.loads(row[2]), 'created_at': row[3]}
+            for row in rows
+        }
+    
+    def _wrap_legacy_index(self) -> None:
+        """
+        Convert a flat L2 index saved by older versions to IndexIDMap2 over IndexFlatIP.
+        
+        Bare legacy indexes store vectors positionally in ascending ID order,
+        so the stored metadata IDs can be attached directly.
+        Stored vectors are L2-normalized so inner product gives cosine similarity.
+        """
+        if isinstance(self.index, faiss.IndexFlat):
+            with self._meta_lock:
+                rows = self._meta_db.execute("SELECT id FROM vector_meta ORDER BY id").fetchall()
+            ids = np.array([row[0] for row in rows], dtype=np.int64)
+            vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        elif self.index.metric_type != faiss.METRIC_INNER_PRODUCT:
+            if faiss.try_extract_index_ivf(self.index) is not None:
+                raise VectorizationError("L2 IVF index cannot be converted; rebuild the vector database")
+            ids = faiss.vector_to_array(self.index.id_map)
+            vectors = self.index.index.reconstruct_n(0, self.index.ntotal)
+        else:
+            return
+        
+        if len(ids) != self.index.ntotal:
+            raise VectorizationError("FAISS index and metadata are out of sync")
+        
+        id_index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.vector_dim))
+        if len(ids):
+            faiss.normalize_L2(vectors)
+            id_index.add_with_ids(vectors, ids)
+        self.index = id_index
+        logger.info(f"Converted legacy FAISS index with {self.index.ntotal} vectors to IndexFlatIP")
+    
+    def _upgrade_to_ivf_index(self) -> None:
+        """
+        Replace the flat index with an IVF-PQ index once it holds enough vectors.
+        
+        IVF-PQ needs a training pass, so the flat index is used until
+        FAISS_IVF_THRESHOLD vectors exist; the stored vectors are then used
+        both to train the quantizers and to populate the new index.
+        """
+        if faiss.try_extract_index_ivf(self.index) is not None:
+            return
+        if self.index.ntotal < self.ivf_threshold:
+            return
+        
+        try:
+            with self._index_lock:
+                vectors = self.index.index.reconstruct_n(0, self.index.ntotal)
+                ids = faiss.vector_to_array(self.index.id_map)
+                
+                ivf_index = faiss.index_factory(self.vector_dim, self.index_factory, faiss.METRIC_INNER_PRODUCT)
+                ivf_index.train(vectors)
+                ivf_index.add_with_ids(vectors, ids)
+                
+                # IVF indexes accept IDs natively; the hashtable direct map lets
+                # remove_ids and reconstruct address vectors by those IDs
+                faiss.extract_index_ivf(ivf_index).set_direct_map_type(faiss.DirectMap.Hashtable)
+                
+                self.index = ivf_index
+            
+            logger.info(f"Converted FAISS index to {self.index_factory} with {self.index.ntotal} vectors")
+            
+        except Exception as e:
+            logger.error(f"Error converting FAISS index to {self.index_factory}: {str(e)}")
+            raise VectorizationError(f"Error converting FAISS index: {str(e)}")
+    
     def _save_faiss_index(self) -> None:
         """Save FAISS index and metadata to disk."""
         try:
             index_path = os.path.join(self.vector_db_path, 'faiss_index.bin')
-            metadata_path = os.path.join(self.vector_db_path, 'metadata.pkl')
             
-            # Save index
-            faiss.write_index(self.index, index_path)
-            
-            # Save metadata
-            with open(metadata_path, 'wb') as f:
-                pickle.dump(self.metadata, f)
-            
-            logger.info(f"Saved FAISS index with {self.index.ntotal} vectors")
+            with self._save_lock:
+                # Snapshot the index in memory so writers only wait for the
+                # serialization; the disk write below still holds _save_lock
+                with self._index_lock:
+                    index = faiss.index_gpu_to_cpu(self.index) if self._gpu_resources is not None else self.index
+                    data = faiss.serialize_index(index)
+                    info = list(self.metadata.items())
+                    ntotal = index.ntotal
+                
+                if self.compress_index:
+                    data = zstandard.ZstdCompressor(level=3).compress(data)
+                
+                # Write to a temp file and swap it in so readers never see a partial index
+                tmp_path = index_path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, index_path)
+                self._index_mtime = os.path.getmtime(index_path)
+                
+                # Vector entries are written as they are added; only the
+                # index-level info needs to be saved alongside the index
+                with self._meta_lock:
+                    self._meta_db.executemany(
+                        "INSERT OR REPLACE INTO vector_info VALUES (?, ?)",
+                        ((key, orjson.dumps(value).decode()) for key, value in info)
+                    )
+                    self._meta_db.commit()
+            
+            logger.info(f"Saved FAISS index with {ntotal} vectors")
             
         except Exception as e:
             logger.error(f"Error saving FAISS index: {str(e)}")
             raise VectorizationError(f"Error saving FAISS index: {str(e)}")
     
-    def _get_embedding(self, text: str) -> np.ndarray:
+    def _schedule_save(self) -> None:
+        """
+        Request a background save of the index.
+        
+        Saves requested within SAVE_DEBOUNCE_SECONDS of each other are
+        coalesced, and the request path never waits on disk I/O.
+        """
+        if self._save_thread is None:
+            with self._save_thread_lock:
+                if self._save_thread is None:
+                    self._save_thread = threading.Thread(
+                        target=self._save_worker, name='faiss-saver', daemon=True
+                    )
+                    self._save_thread.start()
+                    # Don't lose a pending save when the process exits
+                    atexit.register(self.flush)
+        
+        self._save_pending.set()
+    
+    def _save_worker(self) -> None:
+        """Background loop that persists the index after changes settle."""
+        while True:
+            self._save_pending.wait()
+            time.sleep(SAVE_DEBOUNCE_SECONDS)
+            self.flush()
+    
+    def flush(self) -> None:
+        """Save the index now if a background save is pending."""
+        if not self._save_pending.is_set():
+            return
+        self._save_pending.clear()
+        
+        try:
+            self._save_faiss_index()
+        except VectorizationError:
+            # Already logged; keep the save pending so the next change retries
+            self._save_pending.set()
+    
+    def _get_embedding(self, text: Union[str, List[str]]) -> np.ndarray:
         """
-        Get embedding for a text.
+        Get embedding for a text or a batch of texts.
+        
+        Batches are passed to the model in a single encode call, which sorts
+        them by length internally so each mini-batch pads to similar sizes.
         
         Args:
-            text: Text to embed
+            text: Text to embed, or a list of texts
             
         Returns:
-            Embedding vector
+            Embedding vector, or a (len(text), dim) matrix for a list
         """
         try:
-            # Clean text
-            clean_text = text.strip()
-            if not clean_text:
-                clean_text = "Empty text"
-            
-            # Get embedding
-            embedding = self.model.encode(clean_text)
-            
-            return embedding
+            if isinstance(text, str):
+                # Clean text
+                clean_text = text.strip()
+                if not clean_text:
+                    clean_text = "Empty text"
+                
+                # Repeated queries skip the model forward pass
+                key = hashlib.blake2b(clean_text.encode('utf-8'), digest_size=16).digest()
+                with self._embedding_cache_lock:
+                    embedding = self._embedding_cache.get(key)
+                    if embedding is not None:
+                        self._embedding_cache.move_to_end(key)
+                        return embedding
+                
+                # Get embedding
+                embedding = self.model.encode(
+                    clean_text, convert_to_numpy=True, convert_to_tensor=False, normalize_embeddings=True
+                ).astype(np.float32, copy=False)
+                embedding.flags.writeable = False  # Shared by every cache hit
+                
+                with self._embedding_cache_lock:
+                    self._embedding_cache[key] = embedding
+                    if len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+                        self._embedding_cache.popitem(last=False)
+                
+                return embedding
+            
+            clean_texts = [t.strip() or "Empty text" for t in text]
+            return self.model.encode(
+                clean_texts,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            ).astype(np.float32, copy=False)
         except Exception as e:
             logger.error(f"Error getting embedding: {str(e)}")
             raise VectorizationError(f"Error getting embedding: {str(e)}")
     
-    def add_vector(self, text: str, metadata: Dict) -> int:
+    def add_vector(self, text: str, metadata: Dict, now_iso: Optional[str] = None) -> int:
         """
         Add a vector to the database.
         
         Args:
             text: Text to vectorize
             metadata: Metadata for the vector
+            now_iso: Timestamp to record; bulk callers pass one for the whole run
             
         Returns:
             Vector ID
         """
         if self.vector_db_type == 'FAISS':
-            return self._add_vector_faiss(text, metadata)
+            return self._add_vector_faiss(text, metadata, now_iso)
         else:
             raise VectorizationError(f"Unsupported vector database type: {self.vector_db_type}")
     
-    def _add_vector_faiss(self, text: str, metadata: Dict) -> int:
+    def _add_vector_faiss(self, text: str, metadata: Dict, now_iso: Optional[str] = None) -> int:
         """
         Add a vector to FAISS.
         
         Args:
             text: Text to vectorize
             metadata: Metadata for the vector
+            now_iso: Timestamp to record; defaults to the current time
             
         Returns:
             Vector ID
         """
         try:
+            now_iso = now_iso or timezone.now().isoformat()
+            
             # Get embedding
             embedding = self._get_embedding(text)
             
-            # Add vector to FAISS
-            embedding_np = np.array([embedding], dtype=np.float32)
-            
-            # Get current count as vector ID
-            vector_id = self.metadata['count']
-            
-            # Add to FAISS index
-            self.index.add(embedding_np)
+            # Add vector to FAISS; encode already returns float32, so this is a view
+            embedding_np = embedding.reshape(1, -1)
+            
+            with self._index_lock:
+                # Get current count as vector ID
+                vector_id = self.metadata['count']
+                
+                # Add to FAISS index
+                self.index.add_with_ids(embedding_np, np.array([vector_id], dtype=np.int64))
+                
+                # Update count
+                self.metadata['count'] += 1
+                self.metadata['updated_at'] = now_iso
+                self._type_counts[metadata.get('type')] += 1
             
             # Add metadata
-            self.metadata['vectors'].append({
-                'id': vector_id,
-                'text': text[:200] + ('...' if len(text) > 200 else ''),  # Store truncated text
-                'metadata': metadata,
-                'created_at': timezone.now().isoformat()
-            })
-            
-            # Update count
-            self.metadata['count'] += 1
-            self.metadata['updated_at'] = timezone.now().isoformat()
+            self._store_metadata(vector_id, text, metadata, now_iso)
             
-            # Save index and metadata every 100 additions
-            if vector_id % 100 == 0:
-                self._save_faiss_index()
+            # Persist in the background; bulk ingest saves once at the end
+            if not self._bulk_mode:
+                self._schedule_save()
             
             return vector_id
             
@@ -211,29 +645,138 @@ class Vectorizer:
             logger.error(f"Error adding vector to FAISS: {str(e)}")
             raise VectorizationError(f"Error adding vector to FAISS: {str(e)}")
     
-    def search(self, query: str, top_k: int = 5) -> List[Dict]:
+    def _store_metadata(self, vector_id: int, text: str, metadata: Dict, created_at: str) -> None:
+        """Insert or replace the metadata row for a vector."""
+        with self._meta_lock:
+            self._meta_db.execute(
+                "INSERT OR REPLACE INTO vector_meta VALUES (?, ?, ?, ?)",
+                (
+                    vector_id,
+                    text[:200] + ('...' if len(text) > 200 else ''),  # Store truncated text
+                    orjson.dumps(metadata).decode(),
+                    created_at
+                )
+            )
+            # Bulk ingest commits once, when _save_faiss_index saves the index
+            if not self._bulk_mode:
+                self._meta_db.commit()
+    
+    def _ids_for_type(self, vector_type: str) -> np.ndarray:
+        """Get the IDs of all vectors whose metadata has the given type."""
+        with self._meta_lock:
+            rows = self._meta_db.execute(
+                "SELECT id FROM vector_meta WHERE json_extract(metadata, '$.type') = ?", (vector_type,)
+            ).fetchall()
+        return np.array([row[0] for row in rows], dtype=np.int64)
+    
+    def _remove_ids(self, vector_ids: List[int]) -> int:
+        """
+        Remove vectors from the FAISS index by ID.
+        
+        Args:
+            vector_ids: IDs of the vectors to remove
+            
+        Returns:
+            Number of vectors removed
+        """
+        ids = np.asarray(vector_ids, dtype=np.int64)
+        # IDSelectorArray is required for IVF indexes with a hashtable direct map
+        with self._index_lock:
+            return self.index.remove_ids(faiss.IDSelectorArray(len(ids), faiss.swig_ptr(ids)))
+    
+    def add_vectors(self, texts: List[str], metadatas: List[Dict]) -> List[int]:
+        """
+        Add a batch of vectors to the database.
+        
+        Args:
+            texts: Texts to vectorize
+            metadatas: Metadata for each text, in the same order
+            
+        Returns:
+            Vector IDs, in the same order as texts
+        """
+        if self.vector_db_type == 'FAISS':
+            return self._add_vectors_faiss(texts, metadatas)
+        else:
+            raise VectorizationError(f"Unsupported vector database type: {self.vector_db_type}")
+    
+    def _add_vectors_faiss(self, texts: List[str], metadatas: List[Dict]) -> List[int]:
+        """
+        Add a batch of vectors to FAISS with a single encode call.
+        
+        Args:
+            texts: Texts to vectorize
+            metadatas: Metadata for each text, in the same order
+            
+        Returns:
+            Vector IDs, in the same order as texts
+        """
+        if not texts:
+            return []
+        
+        try:
+            embeddings = self._get_embedding(texts)
+            
+            with self._index_lock:
+                start_id = self.metadata['count']
+                vector_ids = np.arange(start_id, start_id + len(texts), dtype=np.int64)
+                
+                self.index.add_with_ids(embeddings, vector_ids)
+                self.metadata['count'] += len(texts)
+                self._type_counts.update(metadata.get('type') for metadata in metadatas)
+            
+            now = timezone.now().isoformat()
+            with self._meta_lock:
+                self._meta_db.executemany(
+                    "INSERT OR REPLACE INTO vector_meta VALUES (?, ?, ?, ?)",
+                    (
+                        (
+                            vector_id,
+                            text[:200] + ('...' if len(text) > 200 else ''),  # Store truncated text
+                            orjson.dumps(metadata).decode(),
+                            now
+                        )
+                        for vector_id, text, metadata in zip(vector_ids.tolist(), texts, metadatas)
+                    )
+                )
+                self._meta_db.commit()
+            
+            self.metadata['updated_at'] = now
+            
+            return vector_ids.tolist()
+            
+        except Exception as e:
+            logger.error(f"Error adding vectors to FAISS: {str(e)}")
+            raise VectorizationError(f"Error adding vectors to FAISS: {str(e)}")
+    
+    def search(self, query: str, top_k: int = 5, filter_type: Optional[str] = None) -> List[Dict]:
         """
         Search for similar vectors.
         
         Args:
             query: Query text
             top_k: Number of results to return
+            filter_type: Optional metadata type to restrict results to
             
         Returns:
             List of search results with metadata
         """
         if self.vector_db_type == 'FAISS':
-            return self._search_faiss(query, top_k)
+            return self._search_faiss(query, top_k, filter_type)
         else:
             raise VectorizationError(f"Unsupported vector database type: {self.vector_db_type}")
     
-    def _search_faiss(self, query: str, top_k: int = 5) -> List[Dict]:
+    def _search_faiss(self, query: str, top_k: int = 5, filter_type: Optional[str] = None) -> List[Dict]:
         """
         Search for similar vectors in FAISS.
         
+        A type filter is applied inside FAISS through an ID selector, so the
+        top_k results are always the best matches of that type.
+        
         Args:
             query: Query text
             top_k: Number of results to return
+            filter_type: Optional metadata type to restrict results to
             
         Returns:
             List of search results with metadata
@@ -241,27 +784,52 @@ class Vectorizer:
         try:
             # Get query embedding
             query_embedding = self._get_embedding(query)
-            query_embedding_np = np.array([query_embedding], dtype=np.float32)
+            query_embedding_np = query_embedding.reshape(1, -1)
             
             # Check if index is empty
             if self.index.ntotal == 0:
                 return []
             
-            # Search FAISS index
-            distances, indices = self.index.search(query_embedding_np, min(top_k, self.index.ntotal))
+            # Only scan nprobe inverted lists when the index is IVF
+            ivf_index = faiss.try_extract_index_ivf(self.index)
+            if ivf_index is not None:
+                ivf_index.nprobe = self.nprobe
+            
+            if filter_type and self._gpu_resources is None:
+                type_ids = self._ids_for_type(filter_type)
+                if not len(type_ids):
+                    return []
+                
+                # IDSelectorBatch hashes the IDs, so membership checks are O(1)
+                selector = faiss.IDSelectorBatch(len(type_ids), faiss.swig_ptr(type_ids))
+                if ivf_index is not None:
+                    params = faiss.SearchParametersIVF()
+                    params.nprobe = self.nprobe
+                else:
+                    params = faiss.SearchParameters()
+                params.sel = selector
+                
+                distances, indices = self.index.search(
+                    query_embedding_np, min(top_k, len(type_ids)), params=params
+                )
+            else:
+                # Search FAISS index
+                distances, indices = self.index.search(query_embedding_np, min(top_k, self.index.ntotal))
+            
+            # Get results with metadata; FAISS may return -1 for not enough results
+            metadata_entries = self._fetch_metadata([int(idx) for idx in indices[0] if idx >= 0])
             
-            # Get results with metadata
             results = []
             for i, idx in enumerate(indices[0]):
-                if idx >= 0:  # FAISS may return -1 for not enough results
-                    metadata_entry = next((item for item in self.metadata['vectors'] if item['id'] == idx), None)
+                if idx >= 0:
+                    metadata_entry = metadata_entries.get(int(idx))
                     if metadata_entry:
                         results.append({
                             'id': metadata_entry['id'],
                             'text': metadata_entry['text'],
                             'metadata': metadata_entry['metadata'],
-                            'distance': float(distances[0][i]),
-                            'similarity': 1.0 / (1.0 + float(distances[0][i]))  # Convert distance to similarity
+                            'distance': 1.0 - float(distances[0][i]),  # Cosine distance
+                            'similarity': float(distances[0][i])  # Inner product of normalized vectors
                         })
             
             return results
@@ -289,8 +857,6 @@ class Vectorizer:
         """
         Delete a vector from FAISS.
         
-        Note: FAISS doesn't support direct deletion, so we rebuild the index without the deleted vector.
-        
         Args:
             vector_id: ID of the vector to delete
             
@@ -299,34 +865,24 @@ class Vectorizer:
         """
         try:
             # Check if vector exists
-            vector_exists = any(item['id'] == vector_id for item in self.metadata['vectors'])
-            
-            if not vector_exists:
+            old_entry = self._fetch_metadata([vector_id]).get(vector_id)
+            if old_entry is None:
                 logger.warning(f"Vector ID {vector_id} not found in metadata")
                 return False
             
-            # Filter out the vector to delete
-            filtered_vectors = [item for item in self.metadata['vectors'] if item['id'] != vector_id]
-            
-            # Create a new index
-            new_index = faiss.IndexFlatL2(self.vector_dim)
-            
-            # Add remaining vectors to the new index
-            for item in filtered_vectors:
-                # We need to re-encode the text since we don't store the actual vectors in metadata
-                embedding = self._get_embedding(item['text'])
-                embedding_np = np.array([embedding], dtype=np.float32)
-                new_index.add(embedding_np)
+            # Remove the vector by ID; no need to rebuild the index
+            with self._index_lock:
+                self._remove_ids([vector_id])
+                self._type_counts[old_entry['metadata'].get('type')] -= 1
             
             # Update metadata
-            self.metadata['vectors'] = filtered_vectors
+            with self._meta_lock:
+                self._meta_db.execute("DELETE FROM vector_meta WHERE id = ?", (vector_id,))
+                self._meta_db.commit()
             self.metadata['updated_at'] = timezone.now().isoformat()
             
-            # Replace old index with new index
-            self.index = new_index
-            
-            # Save updated index and metadata
-            self._save_faiss_index()
+            # Save updated index and metadata in the background
+            self._schedule_save()
             
             return True
             
@@ -346,23 +902,46 @@ class Vectorizer:
         Returns:
             True if successful, False otherwise
         """
-        # For simplicity, we delete and re-add the vector
-        try:
-            # Delete old vector
-            deleted = self.delete_vector(vector_id)
+        if self.vector_db_type == 'FAISS':
+            return self._update_vector_faiss(vector_id, text, metadata)
+        else:
+            raise VectorizationError(f"Unsupported vector database type: {self.vector_db_type}")
+    
+    def _update_vector_faiss(self, vector_id: int, text: str, metadata: Dict) -> bool:
+        """
+        Update a vector in FAISS in place.
+        
+        Args:
+            vector_id: ID of the vector to update
+            text: New text
+            metadata: New metadata
             
-            if not deleted:
-                logger.warning(f"Failed to delete vector ID {vector_id} for update")
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            old_entry = self._fetch_metadata([vector_id]).get(vector_id)
+            if old_entry is None:
+                logger.warning(f"Vector ID {vector_id} not found in metadata")
                 return False
             
-            # Add new vector with same ID
-            # We need to manually set the ID in metadata
-            self.metadata['count'] -= 1  # Decrement count to reuse the same ID
-            new_id = self.add_vector(text, metadata)
+            # Encode before touching the index so a failure leaves it intact
+            embedding_np = self._get_embedding(text).reshape(1, -1)
             
-            if new_id != vector_id:
-                logger.warning(f"Vector ID mismatch during update: expected {vector_id}, got {new_id}")
-                return False
+            # Replace the vector under the same ID
+            with self._index_lock:
+                self._remove_ids([vector_id])
+                self.index.add_with_ids(embedding_np, np.array([vector_id], dtype=np.int64))
+                self._type_counts[old_entry['metadata'].get('type')] -= 1
+                self._type_counts[metadata.get('type')] += 1
+            
+            # Replace metadata
+            now_iso = timezone.now().isoformat()
+            self._store_metadata(vector_id, text, metadata, now_iso)
+            self.metadata['updated_at'] = now_iso
+            
+            # Save updated index and metadata in the background
+            self._schedule_save()
             
             return True
             
@@ -392,8 +971,10 @@ class Vectorizer:
                 defaults={'index_status': 'indexing'}
             )
             
-            # Vectorize tasks
-            for task in Task.objects.filter(vector_id__isnull=True):
+            # Vectorize tasks: collect texts per chunk, then encode each chunk in one batch
+            tasks, task_texts, task_metadatas = [], [], []
+            unvectorized_tasks = Task.objects.filter(vector_id__isnull=True).select_related('project')
+            for task in unvectorized_tasks.iterator(chunk_size=VECTORIZE_CHUNK_SIZE):
                 try:
                     # Prepare text for vectorization
                     task_text = f"""
@@ -422,21 +1003,24 @@ class Vectorizer:
                         'project_name': task.project.name if task.project else None
                     }
                     
-                    # Add vector
-                    vector_id = self.add_vector(task_text, metadata)
-                    
-                    # Update task with vector ID
-                    task.vector_id = str(vector_id)
-                    task.save(update_fields=['vector_id'])
-                    
-                    stats['tasks'] += 1
+                    tasks.append(task)
+                    task_texts.append(task_text)
+                    task_metadatas.append(metadata)
                     
                 except Exception as e:
                     logger.error(f"Error vectorizing task {task.id}: {str(e)}")
                     stats['errors'].append(f"Task {task.id}: {str(e)}")
+                
+                if len(tasks) >= VECTORIZE_CHUNK_SIZE:
+                    stats['tasks'] += self._vectorize_batch(Task, tasks, task_texts, task_metadatas, stats)
+                    tasks, task_texts, task_metadatas = [], [], []
+            
+            stats['tasks'] += self._vectorize_batch(Task, tasks, task_texts, task_metadatas, stats)
             
             # Vectorize projects
-            for project in Project.objects.filter(vector_id__isnull=True):
+            projects, project_texts, project_metadatas = [], [], []
+            unvectorized_projects = Project.objects.filter(vector_id__isnull=True)
+            for project in unvectorized_projects.iterator(chunk_size=VECTORIZE_CHUNK_SIZE):
                 try:
                     # Prepare text for vectorization
                     project_text = f"""
@@ -461,21 +1045,24 @@ class Vectorizer:
                         'created_date': project.created_date.isoformat()
                     }
                     
-                    # Add vector
-                    vector_id = self.add_vector(project_text, metadata)
-                    
-                    # Update project with vector ID
-                    project.vector_id = str(vector_id)
-                    project.save(update_fields=['vector_id'])
-                    
-                    stats['projects'] += 1
+                    projects.append(project)
+                    project_texts.append(project_text)
+                    project_metadatas.append(metadata)
                     
                 except Exception as e:
                     logger.error(f"Error vectorizing project {project.id}: {str(e)}")
                     stats['errors'].append(f"Project {project.id}: {str(e)}")
+                
+                if len(projects) >= VECTORIZE_CHUNK_SIZE:
+                    stats['projects'] += self._vectorize_batch(Project, projects, project_texts, project_metadatas, stats)
+                    projects, project_texts, project_metadatas = [], [], []
+            
+            stats['projects'] += self._vectorize_batch(Project, projects, project_texts, project_metadatas, stats)
             
             # Vectorize comments
-            for comment in Comment.objects.filter(vector_id__isnull=True):
+            comments, comment_texts, comment_metadatas = [], [], []
+            unvectorized_comments = Comment.objects.filter(vector_id__isnull=True).select_related('task', 'author')
+            for comment in unvectorized_comments.iterator(chunk_size=VECTORIZE_CHUNK_SIZE):
                 try:
                     # Prepare text for vectorization
                     comment_text = f"""
@@ -495,18 +1082,22 @@ class Vectorizer:
                         'created_date': comment.created_date.isoformat()
                     }
                     
-                    # Add vector
-                    vector_id = self.add_vector(comment_text, metadata)
-                    
-                    # Update comment with vector ID
-                    comment.vector_id = str(vector_id)
-                    comment.save(update_fields=['vector_id'])
-                    
-                    stats['comments'] += 1
+                    comments.append(comment)
+                    comment_texts.append(comment_text)
+                    comment_metadatas.append(metadata)
                     
                 except Exception as e:
                     logger.error(f"Error vectorizing comment {comment.id}: {str(e)}")
                     stats['errors'].append(f"Comment {comment.id}: {str(e)}")
+                
+                if len(comments) >= VECTORIZE_CHUNK_SIZE:
+                    stats['comments'] += self._vectorize_batch(Comment, comments, comment_texts, comment_metadatas, stats)
+                    comments, comment_texts, comment_metadatas = [], [], []
+            
+            stats['comments'] += self._vectorize_batch(Comment, comments, comment_texts, comment_metadatas, stats)
+            
+            # Switch to IVF-PQ once the index is large enough to train it
+            self._upgrade_to_ivf_index()
             
             # Save index and metadata
             self._save_faiss_index()
@@ -535,6 +1126,37 @@ class Vectorizer:
             stats['errors'].append(str(e))
             return stats
     
+    def _vectorize_batch(self, model, objs: List, texts: List[str], metadatas: List[Dict], stats: Dict) -> int:
+        """
+        Encode a batch of model instances and store their vector IDs.
+        
+        Args:
+            model: Model class of the instances
+            objs: Instances to vectorize
+            texts: Text for each instance
+            metadatas: Metadata for each instance
+            stats: Stats dictionary to record errors in
+            
+        Returns:
+            Number of instances vectorized
+        """
+        if not objs:
+            return 0
+        
+        try:
+            vector_ids = self.add_vectors(texts, metadatas)
+            
+            for obj, vector_id in zip(objs, vector_ids):
+                obj.vector_id = str(vector_id)
+            model.objects.bulk_update(objs, ['vector_id'], batch_size=1000)
+            
+            return len(objs)
+            
+        except Exception as e:
+            logger.error(f"Error vectorizing {model.__name__} batch: {str(e)}")
+            stats['errors'].append(f"{model.__name__} batch: {str(e)}")
+            return 0
+    
     def semantic_search(self, query: str, filter_type: str = None, top_k: int = 5) -> List[Dict]:
         """
         Perform semantic search with optional type filtering.
@@ -548,20 +1170,12 @@ class Vectorizer:
             List of search results with metadata
         """
         try:
-            # Perform basic search
-            results = self.search(query, top_k=top_k * 2)  # Get more results for filtering
+            # GPU indexes do not support ID selectors, so oversample and filter here
+            if filter_type and self._gpu_resources is not None:
+                results = self.search(query, top_k=top_k * 2)
+                return [r for r in results if r['metadata'].get('type') == filter_type][:top_k]
             
-            # Apply type filter if specified
-            if filter_type:
-                results = [r for r in results if r['metadata'].get('type') == filter_type]
-            
-            # Sort by similarity
-            results = sorted(results, key=lambda r: r['similarity'], reverse=True)
-            
-            # Limit to top_k
-            results = results[:top_k]
-            
-            return results
+            return self.search(query, top_k=top_k, filter_type=filter_type)
             
         except Exception as e:
             logger.error(f"Error performing semantic search: {str(e)}")
@@ -575,19 +1189,19 @@ class Vectorizer:
             Dictionary with vector database statistics
         """
         try:
-            # Get vector count by type
-            type_counts = {}
-            for v in self.metadata['vectors']:
-                v_type = v['metadata'].get('type')
-                if v_type:
-                    type_counts[v_type] = type_counts.get(v_type, 0) + 1
+            # Get vector count by type from the incrementally maintained counters
+            type_counts = {v_type: count for v_type, count in self._type_counts.items() if v_type and count > 0}
             
             # Get index size on disk
             index_path = os.path.join(self.vector_db_path, 'faiss_index.bin')
-            metadata_path = os.path.join(self.vector_db_path, 'metadata.pkl')
+            metadata_path = os.path.join(self.vector_db_path, 'metadata.sqlite')
             
             index_size = os.path.getsize(index_path) if os.path.exists(index_path) else 0
-            metadata_size = os.path.getsize(metadata_path) if os.path.exists(metadata_path) else 0
+            metadata_size = sum(
+                os.path.getsize(path)
+                for path in (metadata_path, metadata_path + '-wal')
+                if os.path.exists(path)
+            )
             
             # Format stats
             stats = {
@@ -610,4 +1224,28 @@ class Vectorizer:
             
         except Exception as e:
             logger.error(f"Error getting vector database stats: {str(e)}")
-            raise VectorizationError(f"Error getting vector database stats: {str(e)}")
\ No newline at end of file
+            raise VectorizationError(f"Error getting vector database stats: {str(e)}")
+
+
+_vectorizer = None
+_vectorizer_lock = threading.Lock()
+
+
+def get_vectorizer() -> Vectorizer:
+    """
+    Get the process-wide read-only Vectorizer, creating it on first use.
+    
+    Loading the embedding model takes seconds and hundreds of MB, so views
+    share one instance instead of building a Vectorizer per request. The
+    index is reloaded when another process (e.g. update_vector_db) saves it.
+    """
+    global _vectorizer
+    
+    if _vectorizer is None:
+        with _vectorizer_lock:
+            if _vectorizer is None:
+                _vectorizer = Vectorizer(read_only=True)
+                return _vectorizer
+    
+    _vectorizer.refresh()
+    return _vectorizer
@@ -8,9 +8,12 @@ from django.contrib import messages
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
+from django.db import transaction
 
 from core.forms import LoginForm, RegistrationForm, ProfileUpdateForm
-from core.models import User, LogEntry
+from core.models import User
+from core.utils import log_event
+from core.middleware.auth_middleware import invalidate_cached_user
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +31,7 @@ class LoginView(FormView):
             return redirect('home')
         return super().get(request, *args, **kwargs)
     
+    @transaction.atomic
     def form_valid(self, form):
         username = form.cleaned_data.get('username')
         password = form.cleaned_data.get('password')
@@ -42,15 +46,11 @@ class LoginView(FormView):
             user.save_last_active()
             
             # Log login event
-            LogEntry.objects.create(
-                user=user,
-                level='INFO',
+            log_event(
+                f'User {username} logged in',
                 source='auth',
-                message=f'User {username} logged in',
-                metadata={
-                    'ip': self.request.META.get('REMOTE_ADDR'),
-                    'user_agent': self.request.META.get('HTTP_USER_AGENT', '')
-                }
+                user=user,
+                request=self.request
             )
             
             # Check if user was redirected from another page
@@ -61,14 +61,11 @@ class LoginView(FormView):
             return super().form_valid(form)
         else:
             # Log failed login attempt
-            LogEntry.objects.create(
+            log_event(
+                f'Failed login attempt for username {username}',
                 level='WARNING',
                 source='auth',
-                message=f'Failed login attempt for username {username}',
-                metadata={
-                    'ip': self.request.META.get('REMOTE_ADDR'),
-                    'user_agent': self.request.META.get('HTTP_USER_AGENT', '')
-                }
+                request=self.request
             )
             
             # Add error message
@@ -86,18 +83,15 @@ class LogoutView(RedirectView):
             username = request.user.username
             
             # Log logout event
-            LogEntry.objects.create(
-                user=request.user,
-                level='INFO',
+            log_event(
+                f'User {username} logged out',
                 source='auth',
-                message=f'User {username} logged out',
-                metadata={
-                    'ip': request.META.get('REMOTE_ADDR'),
-                    'user_agent': request.META.get('HTTP_USER_AGENT', '')
-                }
+                user=request.user,
+                request=request
             )
             
-            # Logout the user
+            # Logout the user and drop the cached copy
+            invalidate_cached_user(request.user.pk)
             logout(request)
             
             # Add success message
@@ -119,6 +113,7 @@ class RegistrationView(FormView):
             return redirect('home')
         return super().get(request, *args, **kwargs)
     
+    @transaction.atomic
     def form_valid(self, form):
         # Create new user
         user = form.save(commit=False)
@@ -127,15 +122,11 @@ class RegistrationView(FormView):
         user.save()
         
         # Log registration event
-        LogEntry.objects.create(
-            user=user,
-            level='INFO',
+        log_event(
+            f'New user {user.username} registered',
             source='auth',
-            message=f'New user {user.username} registered',
-            metadata={
-                'ip': self.request.META.get('REMOTE_ADDR'),
-                'user_agent': self.request.META.get('HTTP_USER_AGENT', '')
-            }
+            user=user,
+            request=self.request
         )
         
         # Add success message
@@ -156,6 +147,7 @@ class ProfileView(LoginRequiredMixin, FormView):
         kwargs['instance'] = self.request.user
         return kwargs
     
+    @transaction.atomic
     def form_valid(self, form):
         # Update user profile
         user = form.save(commit=False)
@@ -167,15 +159,11 @@ class ProfileView(LoginRequiredMixin, FormView):
         user.save()
         
         # Log profile update event
-        LogEntry.objects.create(
-            user=user,
-            level='INFO',
+        log_event(
+            f'User {user.username} updated profile',
             source='auth',
-            message=f'User {user.username} updated profile',
-            metadata={
-                'ip': self.request.META.get('REMOTE_ADDR'),
-                'user_agent': self.request.META.get('HTTP_USER_AGENT', '')
-            }
+            user=user,
+            request=self.request
         )
         
         # Add success message
@@ -1,24 +1,68 @@
 import json
+import orjson
 import logging
 import uuid
+from functools import lru_cache
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
-from django.http import JsonResponse, HttpResponseBadRequest, Http404
+from django.http import HttpResponseBadRequest, Http404
 from django.views.generic import View, TemplateView, ListView, DetailView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.utils import timezone
-from django.db.models import Q
+from django.utils.functional import SimpleLazyObject
+from django.db.models import Q, Prefetch, Exists, OuterRef
 
-from core.models import ChatSession, ChatMessage, AIContext, LogEntry, Task, Project, Comment
-from core.claude_ai import ClaudeAI, ClaudeAIError
-from core.vectorization import Vectorizer, VectorizationError
-from core.planfix_api import PlanfixAPI, PlanfixAPIError
+from core.models import ChatSession, ChatMessage, AIContext, Task, Project, Comment
+from core.claude_ai import get_claude_ai, ClaudeAIError
+from core.vectorization import get_vectorizer, VectorizationError
+from core.planfix_api import get_planfix_api, PlanfixAPIError
+from core.utils import log_event, ojson_response
 
 logger = logging.getLogger(__name__)
 
+# Any valid UUID works here; the chat_session route uses the uuid converter
+_SESSION_ID_PLACEHOLDER = str(uuid.UUID(int=0))
+
+
+@lru_cache(maxsize=1)
+def _chat_session_url_template():
+    return reverse('chat_session', kwargs={'session_id': _SESSION_ID_PLACEHOLDER})
+
+
+def chat_session_url(session_id):
+    """Return the URL of a chat session without walking the URL resolver."""
+    return _chat_session_url_template().replace(_SESSION_ID_PLACEHOLDER, str(session_id))
+
+
+def _lazy_session_id():
+    """ID for a new chat session, only generated if the template renders it."""
+    return SimpleLazyObject(lambda: str(uuid.uuid4()))
+
+
+def _user_chat_sessions(user):
+    """
+    Chat sessions of a user for the sidebar, most recent first.
+    
+    The latest message of every session is prefetched into ``recent_messages``
+    so rendering the list does not issue one query per session.
+    
+    Args:
+        user: Owner of the sessions
+        
+    Returns:
+        ChatSession queryset
+    """
+    return ChatSession.objects.filter(user=user).select_related('user').prefetch_related(
+        Prefetch(
+            'messages',
+            queryset=ChatMessage.objects.order_by('-timestamp')[:1],
+            to_attr='recent_messages'
+        )
+    ).order_by('-updated_at')
+
 
 class ChatHomeView(LoginRequiredMixin, ListView):
     """Home view showing chat history."""
@@ -28,11 +72,11 @@ class ChatHomeView(LoginRequiredMixin, ListView):
     
     def get_queryset(self):
         # Get chat sessions for the current user, ordered by most recent first
-        return ChatSession.objects.filter(user=self.request.user).order_by('-updated_at')
+        return _user_chat_sessions(self.request.user)
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['new_session_id'] = str(uuid.uuid4())
+        context['new_session_id'] = _lazy_session_id()
         
         # Get active session if there is one
         active_session_id = self.request.GET.get('session_id')
@@ -40,7 +84,7 @@ class ChatHomeView(LoginRequiredMixin, ListView):
             try:
                 active_session = ChatSession.objects.get(id=active_session_id, user=self.request.user)
                 context['active_session'] = active_session
-                context['messages'] = active_session.messages.all().order_by('timestamp')
+                context['messages'] = active_session.messages.select_related('session').order_by('timestamp')
             except ChatSession.DoesNotExist:
                 pass
                 
@@ -61,9 +105,9 @@ class ChatSessionView(LoginRequiredMixin, DetailView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['messages'] = self.object.messages.all().order_by('timestamp')
-        context['chat_sessions'] = ChatSession.objects.filter(user=self.request.user).order_by('-updated_at')
-        context['new_session_id'] = str(uuid.uuid4())
+        context['messages'] = self.object.messages.select_related('session').order_by('timestamp')
+        context['chat_sessions'] = _user_chat_sessions(self.request.user)
+        context['new_session_id'] = _lazy_session_id()
         return context
 
 
@@ -74,15 +118,15 @@ class CreateChatSessionView(LoginRequiredMixin, View):
         # Generate a new session ID
         session_id = kwargs.get('session_id', str(uuid.uuid4()))
         
-        # Create a new Claude AI client
-        claude_ai = ClaudeAI()
+        # Shared Claude AI client
+        claude_ai = get_claude_ai()
         
         try:
             # Create a new chat session
             session_id = claude_ai.create_chat_session(str(request.user.id))
             
             # Redirect to the chat session
-            return redirect(reverse('chat_session', kwargs={'session_id': session_id}))
+            return redirect(chat_session_url(session_id))
             
         except Exception as e:
             logger.error(f"Error creating chat session: {str(e)}")
@@ -103,21 +147,20 @@ class DeleteChatSessionView(LoginRequiredMixin, View):
             session.delete()
             
             # Log deletion
-            LogEntry.objects.create(
-                user=request.user,
-                level='INFO',
+            log_event(
+                f'Chat session {session_id} deleted',
                 source='chat',
-                message=f'Chat session {session_id} deleted',
+                user=request.user,
                 metadata={
                     'session_title': session.title
                 }
             )
             
-            return JsonResponse({'success': True})
+            return ojson_response({'success': True})
             
         except Exception as e:
             logger.error(f"Error deleting chat session {session_id}: {str(e)}")
-            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+            return ojson_response({'success': False, 'error': str(e)}, status=400)
 
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -133,28 +176,30 @@ class ChatMessageView(LoginRequiredMixin, View):
                 message = data.get('message')
                 
                 if not session_id or not message:
-                    return JsonResponse({
+                    return ojson_response({
                         'success': False,
                         'error': 'Missing session_id or message'
                     }, status=400)
                 
             except json.JSONDecodeError:
-                return JsonResponse({
+                return ojson_response({
                     'success': False,
                     'error': 'Invalid JSON data'
                 }, status=400)
             
-            # Verify session ownership
+            # Verify session ownership and check for earlier messages in one query
             try:
-                session = ChatSession.objects.get(id=session_id, user=request.user)
+                session = ChatSession.objects.only('id', 'user_id').annotate(
+                    has_messages=Exists(ChatMessage.objects.filter(session=OuterRef('pk')))
+                ).get(id=session_id, user_id=request.user.id)
             except ChatSession.DoesNotExist:
-                return JsonResponse({
+                return ojson_response({
                     'success': False,
                     'error': 'Chat session not found'
                 }, status=404)
             
             # Process message with Claude AI
-            claude_ai = ClaudeAI()
+            claude_ai = get_claude_ai()
             
             # First, update user's last active timestamp
             request.user.save_last_active()
@@ -162,7 +207,7 @@ class ChatMessageView(LoginRequiredMixin, View):
             # Process the message
             try:
                 # If this is the first message in the session, rename it
-                if session.messages.count() == 0:
+                if not session.has_messages:
                     # Process the message
                     assistant_response = claude_ai.process_user_message(session_id, message)
                     
@@ -170,7 +215,7 @@ class ChatMessageView(LoginRequiredMixin, View):
                     new_title = claude_ai.rename_chat_session(session_id)
                     
                     # Return response with new title
-                    return JsonResponse({
+                    return ojson_response({
                         'success': True,
                         'response': assistant_response,
                         'title': new_title
@@ -180,21 +225,21 @@ class ChatMessageView(LoginRequiredMixin, View):
                     assistant_response = claude_ai.process_user_message(session_id, message)
                     
                     # Return response
-                    return JsonResponse({
+                    return ojson_response({
                         'success': True,
                         'response': assistant_response
                     })
                 
             except ClaudeAIError as e:
                 logger.error(f"Error processing message with Claude AI: {str(e)}")
-                return JsonResponse({
+                return ojson_response({
                     'success': False,
                     'error': f"Error processing message: {str(e)}"
                 }, status=500)
                 
         except Exception as e:
             logger.error(f"Unexpected error in ChatMessageView: {str(e)}")
-            return JsonResponse({
+            return ojson_response({
                 'success': False,
                 'error': 'An unexpected error occurred'
             }, status=500)
@@ -209,7 +254,7 @@ class ChatHistoryView(LoginRequiredMixin, ListView):
     
     def get_queryset(self):
         # Get chat sessions for the current user, ordered by most recent first
-        return ChatSession.objects.filter(user=self.request.user).order_by('-updated_at')
+        return _user_chat_sessions(self.request.user)
 
 
 class SearchChatView(LoginRequiredMixin, View):
@@ -219,7 +264,7 @@ class SearchChatView(LoginRequiredMixin, View):
         query = request.GET.get('q', '')
         
         if not query:
-            return JsonResponse({
+            return ojson_response({
                 'success': False,
                 'error': 'Missing search query'
             }, status=400)
@@ -227,24 +272,29 @@ class SearchChatView(LoginRequiredMixin, View):
         try:
             # Search for chat messages containing the query
             messages = ChatMessage.objects.filter(
-                session__user=request.user,
+                session__user_id=request.user.id,
                 content__icontains=query
-            ).select_related('session').order_by('-timestamp')[:20]
+            ).select_related('session').only(
+                'id', 'role', 'content', 'timestamp', 'session__id', 'session__title'
+            ).order_by('-timestamp')[:20]
             
             # Format results
             results = []
             for msg in messages:
+                session = msg.session
+                session_id = str(session.id)
+                content = msg.content
                 results.append({
                     'message_id': str(msg.id),
-                    'session_id': str(msg.session.id),
-                    'session_title': msg.session.title,
+                    'session_id': session_id,
+                    'session_title': session.title,
                     'role': msg.role,
-                    'content': msg.content[:200] + ('...' if len(msg.content) > 200 else ''),
+                    'content': content[:200] + ('...' if len(content) > 200 else ''),
                     'timestamp': msg.timestamp.isoformat(),
-                    'url': reverse('chat_session', kwargs={'session_id': msg.session.id})
+                    'url': chat_session_url(session_id)
                 })
             
-            return JsonResponse({
+            return ojson_response({
                 'success': True,
                 'results': results,
                 'count': len(results)
@@ -252,7 +302,7 @@ class SearchChatView(LoginRequiredMixin, View):
             
         except Exception as e:
             logger.error(f"Error searching chat history: {str(e)}")
-            return JsonResponse({
+            return ojson_response({
                 'success': False,
                 'error': f"Error searching chat history: {str(e)}"
             }, status=500)
@@ -267,14 +317,14 @@ class SemanticSearchView(LoginRequiredMixin, View):
         limit = int(request.GET.get('limit', 5))
         
         if not query:
-            return JsonResponse({
+            return ojson_response({
                 'success': False,
                 'error': 'Missing search query'
             }, status=400)
         
         try:
-            # Initialize vectorizer
-            vectorizer = Vectorizer()
+            # Shared vectorizer; the model is loaded once per process
+            vectorizer = get_vectorizer()
             
             # Perform semantic search
             results = vectorizer.semantic_search(query, filter_type, limit)
@@ -307,15 +357,15 @@ class SemanticSearchView(LoginRequiredMixin, View):
                 
                 formatted_results.append(item)
             
-            return JsonResponse({
+            return ojson_response({
                 'success': True,
                 'results': formatted_results,
                 'count': len(formatted_results)
-            })
+            }, option=orjson.OPT_SERIALIZE_NUMPY)
             
         except Exception as e:
             logger.error(f"Error performing semantic search: {str(e)}")
-            return JsonResponse({
+            return ojson_response({
                 'success': False,
                 'error': f"Error performing semantic search: {str(e)}"
             }, status=500)
@@ -333,35 +383,35 @@ class ProcessNaturalLanguageQueryView(LoginRequiredMixin, View):
                 query = data.get('query')
                 
                 if not session_id or not query:
-                    return JsonResponse({
+                    return ojson_response({
                         'success': False,
                         'error': 'Missing session_id or query'
                     }, status=400)
                 
             except json.JSONDecodeError:
-                return JsonResponse({
+                return ojson_response({
                     'success': False,
                     'error': 'Invalid JSON data'
                 }, status=400)
             
             # Verify session ownership
             try:
-                session = ChatSession.objects.get(id=session_id, user=request.user)
+                session = ChatSession.objects.only('id', 'user_id').get(id=session_id, user_id=request.user.id)
             except ChatSession.DoesNotExist:
-                return JsonResponse({
+                return ojson_response({
                     'success': False,
                     'error': 'Chat session not found'
                 }, status=404)
             
             # Process query with Claude AI
-            claude_ai = ClaudeAI()
+            claude_ai = get_claude_ai()
             
             try:
                 # Parse the natural language query
                 parsed_query = claude_ai.parse_natural_language_query(session_id, query)
                 
                 # Fetch data based on the parsed query
-                planfix_api = PlanfixAPI()
+                planfix_api = get_planfix_api()
                 
                 # Determine which API method to call based on the intent
                 intent = parsed_query.get('intent', 'unknown')
@@ -380,7 +430,7 @@ class ProcessNaturalLanguageQueryView(LoginRequiredMixin, View):
                     if task_id:
                         data = planfix_api.get_task_comments(task_id)
                     else:
-                        return JsonResponse({
+                        return ojson_response({
                             'success': False,
                             'error': 'Missing task_id for comments'
                         }, status=400)
@@ -389,7 +439,7 @@ class ProcessNaturalLanguageQueryView(LoginRequiredMixin, View):
                 elif intent == 'project_statuses':
                     data = planfix_api.get_project_statuses()
                 else:
-                    return JsonResponse({
+                    return ojson_response({
                         'success': False,
                         'error': f'Unknown intent: {intent}'
                     }, status=400)
@@ -398,10 +448,9 @@ class ProcessNaturalLanguageQueryView(LoginRequiredMixin, View):
                 analysis = claude_ai.analyze_planfix_data(session_id, query, data)
                 
                 # Add user query and AI response to chat history
-                claude_ai.add_message(session_id, 'user', query)
-                claude_ai.add_message(session_id, 'assistant', analysis)
+                claude_ai.add_messages(session_id, [('user', query), ('assistant', analysis)])
                 
-                return JsonResponse({
+                return ojson_response({
                     'success': True,
                     'response': analysis,
                     'parsed_query': parsed_query,
@@ -413,14 +462,14 @@ class ProcessNaturalLanguageQueryView(LoginRequiredMixin, View):
                 
             except (ClaudeAIError, PlanfixAPIError) as e:
                 logger.error(f"Error processing natural language query: {str(e)}")
-                return JsonResponse({
+                return ojson_response({
                     'success': False,
                     'error': f"Error processing query: {str(e)}"
                 }, status=500)
                 
         except Exception as e:
             logger.error(f"Unexpected error in ProcessNaturalLanguageQueryView: {str(e)}")
-            return JsonResponse({
+            return ojson_response({
                 'success': False,
                 'error': 'An unexpected error occurred'
             }, status=500)
\ No newline at end of file
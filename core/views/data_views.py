@@ -1,88 +1,147 @@
 import json
 import logging
+import orjson
+from datetime import timedelta
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse, HttpResponseBadRequest, Http404
+from django.http import JsonResponse, StreamingHttpResponse, HttpResponseBadRequest, Http404
 from django.views.generic import View, ListView, DetailView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
-from django.db.models import Q, Count, F
+from django.db import connection
+from django.db.models import Q, Count, F, Prefetch, Exists, OuterRef
+from django.db.models.functions import Greatest
 from django.core.paginator import Paginator
+from django.core.cache import cache
 
-from core.models import Task, Project, Comment, User, Attachment, VectorDBMetadata
-from core.planfix_api import PlanfixAPI, PlanfixAPIError
+from core.models import Task, Project, Comment, User, Attachment
+from core.planfix_api import get_planfix_api, PlanfixAPIError, TASK_FIELDS_FULL
+from core.vectorization import get_vectorizer
+from core.tasks import run_sync_planfix_data, run_update_vector_db
+from core.utils import (
+    DASHBOARD_STATS_CACHE_KEY, DASHBOARD_STATS_TIMEOUT, FILTER_CHOICES_TIMEOUT, CachedCountPaginator,
+    get_vector_db_metadata
+)
 
 logger = logging.getLogger(__name__)
 
+# Columns rendered by the list templates; wide text/JSON columns are left out
+TASK_LIST_FIELDS = ('id', 'title', 'status', 'priority', 'deadline', 'created_date', 'project', 'project__name')
+PROJECT_LIST_FIELDS = ('id', 'name', 'status', 'created_date')
+USER_LIST_FIELDS = (
+    'id', 'username', 'first_name', 'last_name', 'email', 'role',
+    'is_active', 'date_joined', 'last_active'
+)
+USER_NAME_FIELDS = ('id', 'first_name', 'last_name')
+
+# Query parameters that narrow down each list view
+TASK_FILTER_PARAMS = ('status', 'priority', 'project', 'assignee', 'q')
+PROJECT_FILTER_PARAMS = ('status', 'responsible', 'q')
+USER_FILTER_PARAMS = ('role', 'q')
+
+# Sort orders accepted from the ?sort= parameter; all map to indexed columns
+TASK_SORTS = frozenset({
+    'created_date', '-created_date', 'deadline', '-deadline', 'priority', '-priority',
+    'status', '-status', 'title', '-title'
+})
+PROJECT_SORTS = frozenset({'created_date', '-created_date', 'name', '-name', 'status', '-status'})
+USER_SORTS = frozenset({'username', '-username', 'last_active', '-last_active'})
+
+# Seconds the detailed vector database stats are cached
+VECTOR_DB_STATS_TIMEOUT = 15
+
+# Largest page size APIDataView requests from Planfix
+API_MAX_LIMIT = 100
+
+# Fields of the related task/attachment rows shown on detail pages
+TASK_ROW_FIELDS = ('id', 'title', 'status', 'priority', 'deadline', 'created_date')
+ATTACHMENT_ROW_FIELDS = ('id', 'name', 'file_type', 'file_size', 'upload_date')
+
+TASK_PRIORITIES = [choice[0] for choice in Task.PRIORITY_CHOICES]
+USER_ROLES = [choice[0] for choice in User.ROLE_CHOICES]
+
+
+def _cached_choices(key, fetch_fn):
+    """Get filter dropdown choices from the cache, computing them on a miss."""
+    return cache.get_or_set(key, fetch_fn, FILTER_CHOICES_TIMEOUT)
+
+
+def _user_choices():
+    return _cached_choices('filter_users', lambda: list(User.objects.only(*USER_NAME_FIELDS)))
+
 
 class DashboardView(LoginRequiredMixin, View):
     """View for the dashboard with statistics and summary data."""
     
     template_name = 'dashboard/index.html'
     
+    def _compute_stats(self):
+        """Compute task, project and user statistics for the dashboard."""
+        now = timezone.now()
+        week_ago = now - timedelta(days=7)
+        
+        # Task totals
+        task_totals = Task.objects.aggregate(
+            total=Count('id'),
+            overdue=Count('id', filter=Q(deadline__lt=now) & ~Q(status__in=['completed', 'closed', 'done']))
+        )
+        task_count = task_totals['total']
+        overdue_tasks = task_totals['overdue']
+        
+        # Status distribution
+        status_distribution = list(Task.objects.values('status').annotate(
+            count=Count('id')
+        ).order_by('-count'))
+        
+        # Priority distribution
+        priority_distribution = list(Task.objects.values('priority').annotate(
+            count=Count('id')
+        ).order_by('priority'))
+        
+        # Project status distribution; the total is its sum
+        project_status_distribution = list(Project.objects.values('status').annotate(
+            count=Count('id')
+        ).order_by('-count'))
+        project_count = sum(item['count'] for item in project_status_distribution)
+        
+        # User statistics (active = active in the last 7 days)
+        user_totals = User.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(last_active__gte=week_ago))
+        )
+        user_count = user_totals['total']
+        active_users = user_totals['active']
+        
+        return {
+            'task_stats': {
+                'total': task_count,
+                'overdue': overdue_tasks,
+                'status_distribution': status_distribution,
+                'priority_distribution': priority_distribution
+            },
+            'project_stats': {
+                'total': project_count,
+                'status_distribution': project_status_distribution,
+            },
+            'user_stats': {
+                'total': user_count,
+                'active': active_users
+            }
+        }
+    
     def get(self, request, *args, **kwargs):
-        # Get statistics
+        # Get statistics, cached briefly since they are full-table aggregates
         try:
-            # Task statistics
-            task_count = Task.objects.count()
-            
-            # Status distribution
-            status_distribution = Task.objects.values('status').annotate(
-                count=Count('id')
-            ).order_by('-count')
-            
-            # Calculate overdue tasks
-            overdue_tasks = Task.objects.filter(
-                deadline__lt=timezone.now()
-            ).exclude(
-                status__in=['completed', 'closed', 'done']
-            ).count()
-            
-            # Priority distribution
-            priority_distribution = Task.objects.values('priority').annotate(
-                count=Count('id')
-            ).order_by('priority')
-            
-            # Project statistics
-            project_count = Project.objects.count()
-            
-            # Project status distribution
-            project_status_distribution = Project.objects.values('status').annotate(
-                count=Count('id')
-            ).order_by('-count')
-            
-            # User statistics
-            user_count = User.objects.count()
-            
-            # Active users (users active in the last 7 days)
-            active_users = User.objects.filter(
-                last_active__gte=timezone.now() - timezone.timedelta(days=7)
-            ).count()
+            stats = cache.get_or_set(DASHBOARD_STATS_CACHE_KEY, self._compute_stats, DASHBOARD_STATS_TIMEOUT)
             
             # Vector database statistics
             try:
-                vector_db_stats = VectorDBMetadata.objects.first()
+                vector_db_stats = get_vector_db_metadata()
             except:
                 vector_db_stats = None
             
             # Prepare context
-            context = {
-                'task_stats': {
-                    'total': task_count,
-                    'overdue': overdue_tasks,
-                    'status_distribution': list(status_distribution),
-                    'priority_distribution': list(priority_distribution)
-                },
-                'project_stats': {
-                    'total': project_count,
-                    'status_distribution': list(project_status_distribution),
-                },
-                'user_stats': {
-                    'total': user_count,
-                    'active': active_users
-                },
-                'vector_db_stats': vector_db_stats
-            }
+            context = dict(stats, vector_db_stats=vector_db_stats)
             
             return render(request, self.template_name, context)
             
@@ -100,50 +159,64 @@ class TaskListView(LoginRequiredMixin, ListView):
     template_name = 'data/task_list.html'
     context_object_name = 'tasks'
     paginate_by = 20
+    paginator_class = CachedCountPaginator
     
     def get_queryset(self):
         queryset = Task.objects.all()
         
-        # Apply filters
-        status = self.request.GET.get('status')
-        if status:
-            queryset = queryset.filter(status=status)
-        
-        priority = self.request.GET.get('priority')
-        if priority:
-            queryset = queryset.filter(priority=priority)
-        
-        project_id = self.request.GET.get('project')
-        if project_id:
-            queryset = queryset.filter(project_id=project_id)
-        
-        assignee_id = self.request.GET.get('assignee')
-        if assignee_id:
-            queryset = queryset.filter(assignees__id=assignee_id)
-        
-        search_query = self.request.GET.get('q')
-        if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) | 
-                Q(description__icontains=search_query)
-            )
-        
-        # Apply role-based filtering
+        # Apply filters; the common no-filter landing page skips this
+        params = self.request.GET
+        if any(params.get(key) for key in TASK_FILTER_PARAMS):
+            status = params.get('status')
+            if status:
+                queryset = queryset.filter(status=status)
+            
+            priority = params.get('priority')
+            if priority:
+                queryset = queryset.filter(priority=priority)
+            
+            project_id = params.get('project')
+            if project_id:
+                queryset = queryset.filter(project_id=project_id)
+            
+            assignee_id = params.get('assignee')
+            if assignee_id:
+                queryset = queryset.filter(assignees__id=assignee_id)
+            
+            search_query = params.get('q')
+            if search_query:
+                queryset = queryset.filter(
+                    Q(title__icontains=search_query) | 
+                    Q(description__icontains=search_query)
+                )
+        
+        # Apply role-based filtering; EXISTS keeps one row per task, so no
+        # DISTINCT is needed
         user = self.request.user
-        if user.role == 'collaborator':
-            # Collaborators can only see tasks they are assigned to
-            queryset = queryset.filter(assignees=user)
-        elif user.role == 'manager':
-            # Managers can see all tasks in their projects
-            managed_projects = Project.objects.filter(responsible_persons=user)
-            queryset = queryset.filter(
-                Q(assignees=user) | Q(project__in=managed_projects)
-            )
+        if user.role in ('collaborator', 'manager'):
+            is_assignee = Exists(Task.assignees.through.objects.filter(task_id=OuterRef('pk'), user_id=user.id))
+            if user.role == 'collaborator':
+                # Collaborators can only see tasks they are assigned to
+                queryset = queryset.filter(is_assignee)
+            else:
+                # Managers can see all tasks in their projects
+                is_project_responsible = Exists(Project.responsible_persons.through.objects.filter(
+                    project_id=OuterRef('project_id'), user_id=user.id
+                ))
+                queryset = queryset.filter(Q(is_assignee) | Q(is_project_responsible))
         # Administrators can see all tasks
         
         # Apply sorting
         sort_by = self.request.GET.get('sort', '-created_date')
-        queryset = queryset.order_by(sort_by)
+        if sort_by not in TASK_SORTS:
+            sort_by = '-created_date'
+        queryset = queryset.select_related('project').only(*TASK_LIST_FIELDS).prefetch_related(
+            Prefetch('assignees', queryset=User.objects.only(*USER_NAME_FIELDS))
+        ).annotate(
+            # Counts shown per row, so the template doesn't run two COUNTs per task
+            comment_count=Count('comments', distinct=True),
+            attachment_count=Count('attachments', distinct=True)
+        ).order_by(sort_by)
         
         return queryset
     
@@ -151,10 +224,16 @@ class TaskListView(LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
         
         # Add filters for template
-        context['statuses'] = Task.objects.values_list('status', flat=True).distinct()
-        context['priorities'] = [choice[0] for choice in Task.PRIORITY_CHOICES]
-        context['projects'] = Project.objects.all()
-        context['assignees'] = User.objects.all()
+        context['statuses'] = _cached_choices(
+            'filter_task_statuses',
+            lambda: list(Task.objects.order_by().values_list('status', flat=True).distinct())
+        )
+        context['priorities'] = TASK_PRIORITIES
+        context['projects'] = _cached_choices(
+            'filter_projects',
+            lambda: list(Project.objects.only('id', 'name'))
+        )
+        context['assignees'] = _user_choices()
         
         # Add current filters
         context['current_filters'] = {
@@ -183,7 +262,7 @@ class TaskDetailView(LoginRequiredMixin, DetailView):
         
         # Check permissions
         user = self.request.user
-        if user.role == 'collaborator' and user not in task.assignees.all():
+        if user.role == 'collaborator' and not task.assignees.filter(pk=user.pk).exists():
             raise Http404("Task not found")
         
         return task
@@ -192,11 +271,11 @@ class TaskDetailView(LoginRequiredMixin, DetailView):
         context = super().get_context_data(**kwargs)
         
         # Add comments and attachments
-        context['comments'] = self.object.comments.all().order_by('created_date')
-        context['attachments'] = self.object.attachments.all()
+        context['comments'] = self.object.comments.select_related('author').order_by('created_date')
+        context['attachments'] = list(self.object.attachments.values(*ATTACHMENT_ROW_FIELDS))
         
         # Add related tasks (subtasks) if any
-        context['subtasks'] = self.object.subtasks.all()
+        context['subtasks'] = list(self.object.subtasks.values(*TASK_ROW_FIELDS))
         
         return context
 
@@ -207,25 +286,28 @@ class ProjectListView(LoginRequiredMixin, ListView):
     template_name = 'data/project_list.html'
     context_object_name = 'projects'
     paginate_by = 20
+    paginator_class = CachedCountPaginator
     
     def get_queryset(self):
         queryset = Project.objects.all()
         
-        # Apply filters
-        status = self.request.GET.get('status')
-        if status:
-            queryset = queryset.filter(status=status)
-        
-        responsible_id = self.request.GET.get('responsible')
-        if responsible_id:
-            queryset = queryset.filter(responsible_persons__id=responsible_id)
-        
-        search_query = self.request.GET.get('q')
-        if search_query:
-            queryset = queryset.filter(
-                Q(name__icontains=search_query) | 
-                Q(description__icontains=search_query)
-            )
+        # Apply filters; the common no-filter landing page skips this
+        params = self.request.GET
+        if any(params.get(key) for key in PROJECT_FILTER_PARAMS):
+            status = params.get('status')
+            if status:
+                queryset = queryset.filter(status=status)
+            
+            responsible_id = params.get('responsible')
+            if responsible_id:
+                queryset = queryset.filter(responsible_persons__id=responsible_id)
+            
+            search_query = params.get('q')
+            if search_query:
+                queryset = queryset.filter(
+                    Q(name__icontains=search_query) | 
+                    Q(description__icontains=search_query)
+                )
         
         # Apply role-based filtering
         user = self.request.user
@@ -236,7 +318,13 @@ class ProjectListView(LoginRequiredMixin, ListView):
         
         # Apply sorting
         sort_by = self.request.GET.get('sort', '-created_date')
-        queryset = queryset.order_by(sort_by)
+        if sort_by not in PROJECT_SORTS:
+            sort_by = '-created_date'
+        queryset = queryset.only(*PROJECT_LIST_FIELDS).prefetch_related(
+            Prefetch('responsible_persons', queryset=User.objects.only(*USER_NAME_FIELDS))
+        ).annotate(
+            task_count=Count('tasks', distinct=True)
+        ).order_by(sort_by)
         
         return queryset
     
@@ -244,8 +332,11 @@ class ProjectListView(LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
         
         # Add filters for template
-        context['statuses'] = Project.objects.values_list('status', flat=True).distinct()
-        context['responsibles'] = User.objects.all()
+        context['statuses'] = _cached_choices(
+            'filter_project_statuses',
+            lambda: list(Project.objects.order_by().values_list('status', flat=True).distinct())
+        )
+        context['responsibles'] = _user_choices()
         
         # Add current filters
         context['current_filters'] = {
@@ -272,7 +363,7 @@ class ProjectDetailView(LoginRequiredMixin, DetailView):
         
         # Check permissions
         user = self.request.user
-        if user.role == 'collaborator' and user not in project.responsible_persons.all():
+        if user.role == 'collaborator' and not project.responsible_persons.filter(pk=user.pk).exists():
             raise Http404("Project not found")
         
         return project
@@ -281,10 +372,10 @@ class ProjectDetailView(LoginRequiredMixin, DetailView):
         context = super().get_context_data(**kwargs)
         
         # Add project tasks
-        context['tasks'] = self.object.tasks.all().order_by('-created_date')
+        context['tasks'] = list(self.object.tasks.values(*TASK_ROW_FIELDS).order_by('-created_date'))
         
         # Add attachments
-        context['attachments'] = self.object.attachments.all()
+        context['attachments'] = list(self.object.attachments.values(*ATTACHMENT_ROW_FIELDS))
         
         # Add responsible persons
         context['responsible_persons'] = self.object.responsible_persons.all()
@@ -299,40 +390,45 @@ class FileDownloadView(LoginRequiredMixin, View):
         file_id = kwargs.get('file_id')
         
         try:
-            # Get attachment
-            attachment = get_object_or_404(Attachment, id=file_id)
+            user = request.user
+            is_manager = request.is_manager
+            
+            # Get attachment; for non-administrators the permission checks are
+            # annotated onto the same query
+            attachments = Attachment.objects.all()
+            if not request.is_admin:
+                task_assignees = Task.assignees.through.objects.filter(user_id=user.id)
+                project_responsibles = Project.responsible_persons.through.objects.filter(user_id=user.id)
+                attachments = attachments.annotate(
+                    is_task_assignee=Exists(task_assignees.filter(task_id=OuterRef('task_id'))),
+                    is_task_project_responsible=Exists(project_responsibles.filter(project_id=OuterRef('task__project_id'))),
+                    is_project_responsible=Exists(project_responsibles.filter(project_id=OuterRef('project_id'))),
+                    is_comment_task_assignee=Exists(task_assignees.filter(task_id=OuterRef('comment__task_id'))),
+                    is_comment_project_responsible=Exists(project_responsibles.filter(project_id=OuterRef('comment__task__project_id'))),
+                )
+            attachment = get_object_or_404(attachments, id=file_id)
             
             # Check permissions
-            user = request.user
             has_permission = False
             
             # Administrators can access any file
-            if user.role == 'administrator':
+            if request.is_admin:
                 has_permission = True
             else:
-                # Check task attachment permissions
-                if attachment.task:
-                    if user.role == 'manager':
-                        # Managers can access files in their projects
-                        if attachment.task.project and user in attachment.task.project.responsible_persons.all():
-                            has_permission = True
-                    
-                    # Anyone assigned to the task can access its files
-                    if user in attachment.task.assignees.all():
+                # Task attachments: managers of the task's project and anyone
+                # assigned to the task
+                if attachment.task_id:
+                    if (is_manager and attachment.is_task_project_responsible) or attachment.is_task_assignee:
                         has_permission = True
                 
-                # Check project attachment permissions
-                if attachment.project:
-                    if user.role == 'manager' or user in attachment.project.responsible_persons.all():
+                # Project attachments: all managers and the project's responsible persons
+                if attachment.project_id:
+                    if is_manager or attachment.is_project_responsible:
                         has_permission = True
                 
-                # Check comment attachment permissions
-                if attachment.comment:
-                    # Same rules as for the task the comment belongs to
-                    task = attachment.comment.task
-                    if user.role == 'manager' and task.project and user in task.project.responsible_persons.all():
-                        has_permission = True
-                    if user in task.assignees.all():
+                # Comment attachments: same rules as for the task the comment belongs to
+                if attachment.comment_id:
+                    if (is_manager and attachment.is_comment_project_responsible) or attachment.is_comment_task_assignee:
                         has_permission = True
             
             if not has_permission:
@@ -349,16 +445,14 @@ class FileDownloadView(LoginRequiredMixin, View):
             else:
                 # Download file from Planfix
                 try:
-                    api = PlanfixAPI()
-                    file_content = api.download_file(attachment.planfix_id)
-                    
-                    # Save file to disk
-                    from django.core.files.base import ContentFile
-                    attachment.local_file.save(attachment.name, ContentFile(file_content), save=True)
+                    api = get_planfix_api()
+                    chunks = api.download_file_stream(attachment.planfix_id)
                     
-                    # Return the file
-                    from django.http import HttpResponse
-                    response = HttpResponse(file_content, content_type=attachment.file_type)
+                    # Stream the file to the client while keeping a local copy
+                    response = StreamingHttpResponse(
+                        self._stream_and_store(attachment, chunks),
+                        content_type=attachment.file_type
+                    )
                     response['Content-Disposition'] = f'attachment; filename="{attachment.name}"'
                     return response
                     
@@ -375,6 +469,32 @@ class FileDownloadView(LoginRequiredMixin, View):
                 'success': False,
                 'error': 'An error occurred while downloading the file'
             }, status=500)
+    
+    @staticmethod
+    def _stream_and_store(attachment, chunks):
+        """
+        Yield downloaded chunks and save them as the attachment's local file.
+        
+        The chunks are spooled to a temporary file which is stored once the
+        download completes; an interrupted download is not saved.
+        """
+        import tempfile
+        from django.core.files import File
+        
+        with tempfile.TemporaryFile() as tmp:
+            try:
+                for chunk in chunks:
+                    tmp.write(chunk)
+                    yield chunk
+            finally:
+                # Release the Planfix connection even if the client disconnects
+                chunks.close()
+            
+            try:
+                tmp.seek(0)
+                attachment.local_file.save(attachment.name, File(tmp), save=True)
+            except Exception as e:
+                logger.error(f"Error saving downloaded file {attachment.name}: {str(e)}")
 
 
 class UserListView(LoginRequiredMixin, ListView):
@@ -383,30 +503,49 @@ class UserListView(LoginRequiredMixin, ListView):
     template_name = 'data/user_list.html'
     context_object_name = 'users'
     paginate_by = 20
+    paginator_class = CachedCountPaginator
     
     def get_queryset(self):
         # Only administrators can see all users
-        if self.request.user.role != 'administrator':
+        if not self.request.is_admin:
             return User.objects.none()
         
         queryset = User.objects.all()
         
-        # Apply filters
-        role = self.request.GET.get('role')
-        if role:
-            queryset = queryset.filter(role=role)
-        
-        search_query = self.request.GET.get('q')
-        if search_query:
-            queryset = queryset.filter(
-                Q(username__icontains=search_query) | 
-                Q(first_name__icontains=search_query) | 
-                Q(last_name__icontains=search_query) | 
-                Q(email__icontains=search_query)
-            )
+        # Apply filters; the common no-filter landing page skips this
+        params = self.request.GET
+        if any(params.get(key) for key in USER_FILTER_PARAMS):
+            role = params.get('role')
+            if role:
+                queryset = queryset.filter(role=role)
+            
+            search_query = params.get('q')
+            if search_query:
+                queryset = queryset.filter(
+                    Q(username__icontains=search_query) | 
+                    Q(first_name__icontains=search_query) | 
+                    Q(last_name__icontains=search_query) | 
+                    Q(email__icontains=search_query)
+                )
+        
+        queryset = queryset.only(*USER_LIST_FIELDS)
+        
+        # Without an explicit sort, PostgreSQL ranks search hits by trigram
+        # similarity; the icontains filters above still decide what matches
+        search_query = params.get('q')
+        if search_query and 'sort' not in params and connection.vendor == 'postgresql':
+            from django.contrib.postgres.search import TrigramSimilarity
+            return queryset.annotate(
+                similarity=Greatest(*(
+                    TrigramSimilarity(field, search_query)
+                    for field in ('username', 'first_name', 'last_name', 'email')
+                ))
+            ).order_by('-similarity', 'username')
         
         # Apply sorting
         sort_by = self.request.GET.get('sort', 'username')
+        if sort_by not in USER_SORTS:
+            sort_by = 'username'
         queryset = queryset.order_by(sort_by)
         
         return queryset
@@ -415,7 +554,7 @@ class UserListView(LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
         
         # Add filters for template
-        context['roles'] = [choice[0] for choice in User.ROLE_CHOICES]
+        context['roles'] = USER_ROLES
         
         # Add current filters
         context['current_filters'] = {
@@ -430,9 +569,31 @@ class UserListView(LoginRequiredMixin, ListView):
 class APIDataView(LoginRequiredMixin, View):
     """View for accessing Planfix data via API."""
     
+    # data_type -> PlanfixAPI method names
+    ITEM_HANDLERS = {
+        'task': 'get_task',
+        'project': 'get_project',
+        'employee': 'get_employee',
+        'task_comments': 'get_task_comments',
+        'task_attachments': 'get_task_attachments',
+    }
+    BATCH_HANDLERS = {
+        'task': 'get_tasks_by_ids',
+    }
+    # data_type -> (method name, extra kwargs, key of the item list in the response)
+    LIST_HANDLERS = {
+        'task': ('get_tasks', {'fields': TASK_FIELDS_FULL}, 'tasks'),
+        'project': ('get_projects', {}, 'projects'),
+        'employee': ('get_employees', {}, 'users'),
+    }
+    STATIC_HANDLERS = {
+        'task_statuses': 'get_task_statuses',
+        'project_statuses': 'get_project_statuses',
+    }
+    
     def get(self, request, *args, **kwargs):
         # Ensure only managers and administrators can access API data
-        if request.user.role not in ['administrator', 'manager']:
+        if not request.is_manager:
             return JsonResponse({
                 'success': False,
                 'error': 'Permission denied'
@@ -441,87 +602,70 @@ class APIDataView(LoginRequiredMixin, View):
         data_type = kwargs.get('data_type')
         item_id = kwargs.get('item_id')
         
+        # Parse list parameters once; the page size is capped so a single
+        # request can't pull an unbounded amount of data from Planfix
+        try:
+            limit = min(max(int(request.GET.get('limit', 20)), 1), API_MAX_LIMIT)
+            page = max(int(request.GET.get('page', 1)), 1)
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid pagination parameters'
+            }, status=400)
+        offset = (page - 1) * limit
+        filters = {key: value for key, value in request.GET.items() if key not in ('page', 'limit', 'ids')}
+        
+        # ?ids=1,2,3 fetches several items in one call
+        ids = [i for i in request.GET.get('ids', '').split(',') if i][:API_MAX_LIMIT]
+        if ids and not all(i.isdigit() for i in ids):
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid ids parameter'
+            }, status=400)
+        
         try:
-            api = PlanfixAPI()
+            api = get_planfix_api()
             
-            if data_type == 'task':
-                if item_id:
-                    data = api.get_task(item_id)
-                else:
-                    # Get tasks with optional filters
-                    filters = {}
-                    for key, value in request.GET.items():
-                        if key not in ['page', 'limit']:
-                            filters[key] = value
-                    
-                    limit = int(request.GET.get('limit', 20))
-                    page = int(request.GET.get('page', 1))
-                    offset = (page - 1) * limit
-                    
-                    data = api.get_tasks(filters=filters, limit=limit, offset=offset)
-                
-            elif data_type == 'project':
-                if item_id:
-                    data = api.get_project(item_id)
-                else:
-                    # Get projects with optional filters
-                    filters = {}
-                    for key, value in request.GET.items():
-                        if key not in ['page', 'limit']:
-                            filters[key] = value
-                    
-                    limit = int(request.GET.get('limit', 20))
-                    page = int(request.GET.get('page', 1))
-                    offset = (page - 1) * limit
-                    
-                    data = api.get_projects(filters=filters, limit=limit, offset=offset)
-                
-            elif data_type == 'employee':
-                if item_id:
-                    data = api.get_employee(item_id)
-                else:
-                    # Get employees with optional filters
-                    filters = {}
-                    for key, value in request.GET.items():
-                        if key not in ['page', 'limit']:
-                            filters[key] = value
-                    
-                    limit = int(request.GET.get('limit', 20))
-                    page = int(request.GET.get('page', 1))
-                    offset = (page - 1) * limit
-                    
-                    data = api.get_employees(filters=filters, limit=limit, offset=offset)
-                
-            elif data_type == 'task_comments':
-                if item_id:
-                    data = api.get_task_comments(item_id)
-                else:
-                    return JsonResponse({
-                        'success': False,
-                        'error': 'Task ID is required for comments'
-                    }, status=400)
-                
-            elif data_type == 'task_attachments':
-                if item_id:
-                    data = api.get_task_attachments(item_id)
+            if data_type in self.STATIC_HANDLERS:
+                data = getattr(api, self.STATIC_HANDLERS[data_type])()
+            
+            elif item_id and data_type in self.ITEM_HANDLERS:
+                data = getattr(api, self.ITEM_HANDLERS[data_type])(item_id)
+            
+            elif ids and data_type in self.ITEM_HANDLERS:
+                if data_type in self.BATCH_HANDLERS:
+                    # One batched Planfix request for all IDs, returned in request order
+                    items = getattr(api, self.BATCH_HANDLERS[data_type])(ids)
+                    data = [items[int(i)] for i in ids if int(i) in items]
                 else:
-                    return JsonResponse({
-                        'success': False,
-                        'error': 'Task ID is required for attachments'
-                    }, status=400)
-                
-            elif data_type == 'task_statuses':
-                data = api.get_task_statuses()
-                
-            elif data_type == 'project_statuses':
-                data = api.get_project_statuses()
+                    # No batch endpoint; fetch the items concurrently
+                    data = api.map_items(getattr(api, self.ITEM_HANDLERS[data_type]), ids)
+            
+            elif data_type in self.LIST_HANDLERS:
+                method_name, extra_kwargs, list_key = self.LIST_HANDLERS[data_type]
+                data = getattr(api, method_name)(filters=filters, limit=limit, offset=offset, **extra_kwargs)
                 
+                if isinstance(data, dict) and isinstance(data.get(list_key), list):
+                    # Large lists are encoded item by item instead of as one string
+                    return StreamingHttpResponse(
+                        _iter_json_data(data, list_key), content_type='application/json'
+                    )
+            
+            elif data_type in self.ITEM_HANDLERS:
+                return JsonResponse({
+                    'success': False,
+                    'error': f'An item ID is required for {data_type}'
+                }, status=400)
+            
             else:
                 return JsonResponse({
                     'success': False,
                     'error': f'Unknown data type: {data_type}'
                 }, status=400)
             
+            if isinstance(data, list):
+                return StreamingHttpResponse(_iter_json_data(data), content_type='application/json')
+            
             return JsonResponse({
                 'success': True,
                 'data': data
@@ -541,12 +685,41 @@ class APIDataView(LoginRequiredMixin, View):
             }, status=500)
 
 
+def _iter_json_data(data, list_key=None):
+    """
+    Yield a {"success": true, "data": ...} JSON document in pieces.
+    
+    Args:
+        data: List of items, or a dict holding the items under list_key
+        list_key: Key of the item list when data is a dict; the dict's other
+            keys are kept in the output
+    """
+    if list_key is None:
+        items = data
+        head = b'{"success":true,"data":['
+        tail = b']}'
+    else:
+        items = data[list_key]
+        envelope = orjson.dumps({key: value for key, value in data.items() if key != list_key})
+        # Reopen the encoded envelope object and append the list key to it
+        separator = b',' if envelope != b'{}' else b''
+        head = b'{"success":true,"data":' + envelope[:-1] + separator + orjson.dumps(list_key) + b':['
+        tail = b']}}'
+    
+    yield head
+    for index, item in enumerate(items):
+        if index:
+            yield b','
+        yield orjson.dumps(item)
+    yield tail
+
+
 class VectorDatabaseStatusView(LoginRequiredMixin, View):
     """View for checking vector database status."""
     
     def get(self, request, *args, **kwargs):
         # Ensure only administrators can access vector database status
-        if request.user.role != 'administrator':
+        if not request.is_admin:
             return JsonResponse({
                 'success': False,
                 'error': 'Permission denied'
@@ -554,7 +727,7 @@ class VectorDatabaseStatusView(LoginRequiredMixin, View):
         
         try:
             # Get vector database metadata
-            metadata = VectorDBMetadata.objects.first()
+            metadata = get_vector_db_metadata()
             
             if not metadata:
                 return JsonResponse({
@@ -563,9 +736,13 @@ class VectorDatabaseStatusView(LoginRequiredMixin, View):
                     'message': 'Vector database not initialized'
                 })
             
-            # Initialize vectorizer to get detailed stats
-            vectorizer = Vectorizer()
-            stats = vectorizer.get_vector_database_stats()
+            # Detailed stats from the shared vectorizer, cached briefly so
+            # polling admins don't recompute them on every request
+            stats = cache.get_or_set(
+                'vector_db_detailed_stats',
+                lambda: get_vectorizer().get_vector_database_stats(),
+                VECTOR_DB_STATS_TIMEOUT
+            )
             
             # Combine with database metadata
             result = {
@@ -594,7 +771,7 @@ class TriggerDataSyncView(LoginRequiredMixin, View):
     
     def post(self, request, *args, **kwargs):
         # Ensure only administrators can trigger data sync
-        if request.user.role != 'administrator':
+        if not request.is_admin:
             return JsonResponse({
                 'success': False,
                 'error': 'Permission denied'
@@ -605,9 +782,6 @@ class TriggerDataSyncView(LoginRequiredMixin, View):
             data = json.loads(request.body)
             sync_type = data.get('sync_type', 'all')
             
-            # Import management command function
-            from django.core.management import call_command
-            
             # Prepare command arguments
             command_args = []
             
@@ -620,24 +794,14 @@ class TriggerDataSyncView(LoginRequiredMixin, View):
             elif sync_type == 'full':
                 command_args.append('--full')
             
-            # Call management command
-            from threading import Thread
-            
-            def run_sync_command():
-                try:
-                    call_command('sync_planfix_data', *command_args)
-                except Exception as e:
-                    logger.error(f"Error during async data sync: {str(e)}")
-            
-            # Start sync in background thread
-            sync_thread = Thread(target=run_sync_command)
-            sync_thread.daemon = True
-            sync_thread.start()
+            # Queue the management command on a Celery worker
+            result = run_sync_planfix_data.delay(command_args)
             
             return JsonResponse({
                 'success': True,
                 'message': f'Data synchronization ({sync_type}) started in background',
-                'sync_type': sync_type
+                'sync_type': sync_type,
+                'task_id': result.id
             })
             
         except Exception as e:
@@ -653,7 +817,7 @@ class TriggerVectorUpdateView(LoginRequiredMixin, View):
     
     def post(self, request, *args, **kwargs):
         # Ensure only administrators can trigger vector update
-        if request.user.role != 'administrator':
+        if not request.is_admin:
             return JsonResponse({
                 'success': False,
                 'error': 'Permission denied'
@@ -664,9 +828,6 @@ class TriggerVectorUpdateView(LoginRequiredMixin, View):
             data = json.loads(request.body)
             update_type = data.get('update_type', 'update')
             
-            # Import management command function
-            from django.core.management import call_command
-            
             # Prepare command arguments
             command_args = []
             
@@ -679,24 +840,14 @@ class TriggerVectorUpdateView(LoginRequiredMixin, View):
             elif update_type == 'comments':
                 command_args.append('--comments-only')
             
-            # Call management command
-            from threading import Thread
-            
-            def run_update_command():
-                try:
-                    call_command('update_vector_db', *command_args)
-                except Exception as e:
-                    logger.error(f"Error during async vector update: {str(e)}")
-            
-            # Start update in background thread
-            update_thread = Thread(target=run_update_command)
-            update_thread.daemon = True
-            update_thread.start()
+            # Queue the management command on a Celery worker
+            result = run_update_vector_db.delay(command_args)
             
             return JsonResponse({
                 'success': True,
                 'message': f'Vector database update ({update_type}) started in background',
-                'update_type': update_type
+                'update_type': update_type,
+                'task_id': result.id
             })
             
         except Exception as e:
@@ -0,0 +1,13 @@
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'intelligent_assistant.settings')
+
+app = Celery('intelligent_assistant')
+
+# Read CELERY_* options from the Django settings
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Pick up tasks.py modules of the installed apps
+app.autodiscover_tasks()
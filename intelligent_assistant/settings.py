@@ -1,4 +1,6 @@
 import os
+import pickle
+import tempfile
 from pathlib import Path
 import environ
 
@@ -18,9 +20,72 @@ env = environ.Env(
 )
 
 
+
+def _read_env_file(path):
+    """
+    Load a .env file into os.environ without overriding variables already set.
+
+    The parsed values are pickled to <path>.cache.pkl and reused for as long
+    as the file's mtime and size are unchanged, so every worker process
+    doesn't reparse it.
+
+    Args:
+        path: Path of the .env file
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    cache_path = f'{path}.cache.pkl'
+    values = None
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, cached_values = pickle.load(f)
+        if cached_key == key:
+            values = cached_values
+    except Exception:
+        pass
+
+    if values is None:
+        # read_env() writes into cls.ENVIRON, so give it a fresh dict to collect into
+        class _EnvFile(environ.Env):
+            ENVIRON = {}
+
+        _EnvFile.read_env(path)
+        values = _EnvFile.ENVIRON
+
+        # mkstemp creates the file readable by the owner only; os.replace
+        # keeps concurrently starting processes from seeing a partial file
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.env.cache.')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((key, values), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    for name, value in values.items():
+        os.environ.setdefault(name, value)
+
+
 # Read .env file if it exists
-BASE_DIR = Path(__file__).resolve().parent.parent
-environ.Env.read_env(os.path.join(BASE_DIR, '.env'))
+# abspath/dirname are plain string operations; Path.resolve() stats every component
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_DIR = Path(_BASE_DIR)
+_read_env_file(f'{_BASE_DIR}/.env')
+
+# Snapshot of the environment for plain string settings. A dict lookup
+# skips env()'s parsing; env() is kept for values that need casting
+_ENV = dict(os.environ)
+
+# Plain string paths, built once from _BASE_DIR instead of joining BASE_DIR
+_LOG_DIR = f'{_BASE_DIR}/logs'
+_LOG_FILE = f'{_LOG_DIR}/intelligent_assistant.log'
 
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = env('SECRET_KEY')
@@ -28,33 +93,51 @@ SECRET_KEY = env('SECRET_KEY')
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = env('DEBUG')
 
-ALLOWED_HOSTS = env('ALLOWED_HOSTS')
+ALLOWED_HOSTS = tuple(env('ALLOWED_HOSTS'))
 
 # Application definition
-INSTALLED_APPS = [
+# Apps and middleware only the web process needs are kept separate, so
+# settings_mgmt can leave them out of management commands
+_CORE_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'core',
+]
+
+_HTTP_APPS = [
     'django_filters',
     'rest_framework',
     'corsheaders',
-    'core',
 ]
 
-MIDDLEWARE = [
+INSTALLED_APPS = _CORE_APPS + _HTTP_APPS
+
+_CORE_MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
-    'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.auth_middleware.CachedAuthenticationMiddleware',
+    'core.middleware.auth_middleware.UserRoleMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'core.middleware.logging_middleware.LogEntryBufferMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.locale.LocaleMiddleware',
+]
+
+# WhiteNoise answers static file requests right after SecurityMiddleware,
+# before any session or user lookup. CorsMiddleware has to run before
+# CommonMiddleware.
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    *_CORE_MIDDLEWARE[2:],
 ]
 
 ROOT_URLCONF = 'intelligent_assistant.urls'
@@ -62,7 +145,7 @@ ROOT_URLCONF = 'intelligent_assistant.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [BASE_DIR / 'templates'],
+        'DIRS': [f'{_BASE_DIR}/templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -81,7 +164,7 @@ WSGI_APPLICATION = 'intelligent_assistant.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': f'{_BASE_DIR}/db.sqlite3',
     }
 }
 
@@ -107,10 +190,21 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing - new hashes use Argon2id, existing PBKDF2 hashes are
+# upgraded on the next successful login
+PASSWORD_HASHERS = [
+    'core.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 # Authentication
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/chat/'
 LOGOUT_REDIRECT_URL = '/login/'
+AUTH_USER_CACHE_TIMEOUT = env.int('AUTH_USER_CACHE_TIMEOUT', default=300)  # Seconds a logged-in user stays cached
 
 # Internationalization
 LANGUAGE_CODE = env('LANGUAGE_CODE')
@@ -125,43 +219,54 @@ LANGUAGES = [
 ]
 
 LOCALE_PATHS = [
-    BASE_DIR / 'locale',
+    f'{_BASE_DIR}/locale',
 ]
 
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
-STATIC_ROOT = BASE_DIR / 'staticfiles'
-STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_ROOT = f'{_BASE_DIR}/staticfiles'
+STATICFILES_DIRS = [f'{_BASE_DIR}/static']
 
 # Media files
 MEDIA_URL = '/media/'
-MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_ROOT = f'{_BASE_DIR}/media'
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Planfix API settings
-PLANFIX_API_URL = env('PLANFIX_API_URL', default='https://deventky.planfix.com/rest').rstrip('/')
-PLANFIX_API_TOKEN = env('PLANFIX_API_TOKEN', default='')
-PLANFIX_ACCOUNT_ID = env('PLANFIX_ACCOUNT_ID', default='deventky')
-PLANFIX_USER_ID = env('PLANFIX_USER_ID', default='')
-PLANFIX_USER_API_KEY = env('PLANFIX_USER_API_KEY', default='')
+PLANFIX_API_URL = _ENV.get('PLANFIX_API_URL', 'https://deventky.planfix.com/rest').rstrip('/')
+PLANFIX_API_TOKEN = _ENV.get('PLANFIX_API_TOKEN', '')
+PLANFIX_ACCOUNT_ID = _ENV.get('PLANFIX_ACCOUNT_ID', 'deventky')
+PLANFIX_USER_ID = _ENV.get('PLANFIX_USER_ID', '')
+PLANFIX_USER_API_KEY = _ENV.get('PLANFIX_USER_API_KEY', '')
 
 # Claude AI settings
-ANTHROPIC_API_KEY = env('ANTHROPIC_API_KEY', default='')
-CLAUDE_MODEL = env('CLAUDE_MODEL', default='claude-3-5-sonnet')
+ANTHROPIC_API_KEY = _ENV.get('ANTHROPIC_API_KEY', '')
+CLAUDE_MODEL = _ENV.get('CLAUDE_MODEL', 'claude-3-5-sonnet')
 CLAUDE_MAX_TOKENS = env.int('CLAUDE_MAX_TOKENS', default=4000)
 
 # Vector database settings
-VECTOR_DB_TYPE = env('VECTOR_DB_TYPE', default='FAISS')
-VECTOR_DB_PATH = env('VECTOR_DB_PATH', default=os.path.join(BASE_DIR, 'vector_db'))
-EMBEDDING_MODEL = env('EMBEDDING_MODEL', default='all-MiniLM-L6-v2')
+VECTOR_DB_TYPE = _ENV.get('VECTOR_DB_TYPE', 'FAISS')
+VECTOR_DB_PATH = _ENV.get('VECTOR_DB_PATH', f'{_BASE_DIR}/vector_db')
+EMBEDDING_MODEL = _ENV.get('EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
+EMBEDDING_BACKEND = _ENV.get('EMBEDDING_BACKEND', 'torch')  # 'torch' or 'onnx'
+# Quantized ONNX weights shipped with the model, e.g. 'onnx/model_qint8_avx512_vnni.onnx'
+EMBEDDING_ONNX_FILE = _ENV.get('EMBEDDING_ONNX_FILE', '')
+TORCH_NUM_THREADS = env.int('TORCH_NUM_THREADS', default=os.cpu_count() or 4)
+VECTORIZER_PRELOAD = env.bool('VECTORIZER_PRELOAD', default=False)  # Load the model at startup
+FAISS_INDEX_FACTORY = _ENV.get('FAISS_INDEX_FACTORY', 'IVF256,PQ32x8')
+FAISS_IVF_THRESHOLD = env.int('FAISS_IVF_THRESHOLD', default=10000)  # Vectors needed before switching to IVF
+FAISS_NPROBE = env.int('FAISS_NPROBE', default=16)
+FAISS_COMPRESS_INDEX = env.bool('FAISS_COMPRESS_INDEX', default=False)  # zstd on disk; disables mmap loading
 
 # CORS settings
-CORS_ALLOWED_ORIGINS = env.list('CORS_ALLOWED_ORIGINS', default=[
+# Tuples rather than sets: django-cors-headers requires a sequence, and
+# Django matches ALLOWED_HOSTS patterns one by one either way
+CORS_ALLOWED_ORIGINS = tuple(env.list('CORS_ALLOWED_ORIGINS', default=[
     'http://localhost:8000',
     'http://127.0.0.1:8000',
-])
+]))
 
 # Django REST Framework settings
 REST_FRAMEWORK = {
@@ -209,7 +314,8 @@ LOGGING = {
         'file': {
             'level': 'INFO',
             'class': 'logging.FileHandler',
-            'filename': os.path.join(BASE_DIR, 'logs', 'intelligent_assistant.log'),
+            'filename': _LOG_FILE,
+            'delay': True,  # Open the file on the first record, not at startup
             'formatter': 'verbose',
         },
     },
@@ -227,8 +333,10 @@ LOGGING = {
     },
 }
 
-# Ensure the logs directory exists
-os.makedirs(os.path.join(BASE_DIR, 'logs'), exist_ok=True)
+# The file handler may write before any app's ready() runs, so the logs
+# directory has to exist here; isdir() skips the mkdir syscall once it does
+if not os.path.isdir(_LOG_DIR):
+    os.makedirs(_LOG_DIR, exist_ok=True)
 
 # Cache settings
 CACHES = {
@@ -237,10 +345,153 @@ CACHES = {
     }
 }
 
+# Sessions - read through the cache, falling back to the database on a miss
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'default'
+
 # Celery settings (for background tasks)
-CELERY_BROKER_URL = env('CELERY_BROKER_URL', default='redis://localhost:6379/0')
-CELERY_RESULT_BACKEND = env('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
+CELERY_BROKER_URL = _ENV.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+CELERY_RESULT_BACKEND = _ENV.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
-CELERY_TIMEZONE = TIME_ZONE
\ No newline at end of file
+CELERY_TIMEZONE = TIME_ZONE
+
+# Production settings, enabled with DJANGO_ENV=prod
+if _ENV.get('DJANGO_ENV', 'dev') == 'prod':
+    DEBUG = False
+
+    # Allow only specific hosts
+    ALLOWED_HOSTS = tuple(env.list('ALLOWED_HOSTS'))
+
+    # Database - persistent connections, checked before reuse so a dropped
+    # connection doesn't fail the request. Set DB_DISABLE_SERVER_SIDE_CURSORS
+    # when connecting through pgbouncer in transaction pooling mode.
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': env('DB_NAME'),
+            'USER': env('DB_USER'),
+            'PASSWORD': env('DB_PASSWORD'),
+            'HOST': env('DB_HOST'),
+            'PORT': env('DB_PORT'),
+            'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=600),  # Seconds
+            'CONN_HEALTH_CHECKS': True,
+            'DISABLE_SERVER_SIDE_CURSORS': env.bool('DB_DISABLE_SERVER_SIDE_CURSORS', default=False),
+            'OPTIONS': {
+                'sslmode': _ENV.get('DB_SSLMODE', 'require'),
+            },
+        }
+    }
+
+    # Static files - use CDN in production. collectstatic stores gzip and,
+    # with the Brotli package installed, brotli copies that WhiteNoise serves
+    # to clients accepting them
+    STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+
+    # Media files - use S3 or other cloud storage in production
+    # Uncomment if using S3 for media files
+    # DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
+    # AWS_ACCESS_KEY_ID = env('AWS_ACCESS_KEY_ID')
+    # AWS_SECRET_ACCESS_KEY = env('AWS_SECRET_ACCESS_KEY')
+    # AWS_STORAGE_BUCKET_NAME = env('AWS_STORAGE_BUCKET_NAME')
+    # AWS_S3_REGION_NAME = env('AWS_S3_REGION_NAME')
+    # AWS_DEFAULT_ACL = 'private'
+    # AWS_S3_CUSTOM_DOMAIN = env('AWS_S3_CUSTOM_DOMAIN', default=None)
+    # AWS_S3_OBJECT_PARAMETERS = {
+    #     'CacheControl': 'max-age=86400',
+    # }
+
+    # Security settings
+    SECURE_SSL_REDIRECT = True
+    SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+    SESSION_COOKIE_SECURE = True
+    CSRF_COOKIE_SECURE = True
+    SECURE_HSTS_SECONDS = 31536000  # 1 year
+    SECURE_HSTS_INCLUDE_SUBDOMAINS = True
+    SECURE_HSTS_PRELOAD = True
+    SECURE_CONTENT_TYPE_NOSNIFF = True
+    SECURE_BROWSER_XSS_FILTER = True
+    X_FRAME_OPTIONS = 'DENY'
+
+    # CORS settings - restrict to your domain
+    CORS_ALLOWED_ORIGINS = tuple(env.list('CORS_ALLOWED_ORIGINS'))
+
+    # Logging - use rotating file handler in production
+    LOGGING = {
+        'version': 1,
+        'disable_existing_loggers': False,
+        'formatters': {
+            'verbose': {
+                'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
+                'style': '{',
+            },
+        },
+        'handlers': {
+            'console': {
+                'level': 'WARNING',
+                'class': 'logging.StreamHandler',
+                'formatter': 'verbose',
+            },
+            'file': {
+                'level': 'INFO',
+                'class': 'logging.handlers.RotatingFileHandler',
+                'filename': _LOG_FILE,
+                'delay': True,
+                'maxBytes': 1024 * 1024 * 10,  # 10 MB
+                'backupCount': 10,
+                'formatter': 'verbose',
+            },
+        },
+        'loggers': {
+            'django': {
+                'handlers': ['console', 'file'],
+                'level': 'WARNING',
+                'propagate': True,
+            },
+            'core': {
+                'handlers': ['console', 'file'],
+                'level': 'INFO',
+                'propagate': True,
+            },
+        },
+    }
+
+    # Cache - use Redis in production. Only dotted paths here: Django imports
+    # django_redis (and redis) on first use of the cache, not at startup
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': _ENV.get('REDIS_URL', 'redis://localhost:6379/1'),
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            }
+        }
+    }
+
+    # Session - store in cache in production
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+    SESSION_CACHE_ALIAS = 'default'
+
+    # Email settings
+    EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    EMAIL_HOST = _ENV.get('EMAIL_HOST', '')
+    EMAIL_PORT = env.int('EMAIL_PORT', default=587)
+    EMAIL_HOST_USER = _ENV.get('EMAIL_HOST_USER', '')
+    EMAIL_HOST_PASSWORD = _ENV.get('EMAIL_HOST_PASSWORD', '')
+    EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS', default=True)
+    DEFAULT_FROM_EMAIL = _ENV.get('DEFAULT_FROM_EMAIL', 'noreply@example.com')
+
+    # Celery settings - broker, serializers and timezone come from settings.py
+    CELERY_TASK_ALWAYS_EAGER = False  # Ensure tasks run asynchronously in production
+
+    # Increase timeout for vector operations
+    CELERY_TASK_TIME_LIMIT = 3600  # 1 hour
+    CELERY_TASK_SOFT_TIME_LIMIT = 3540  # 59 minutes
+
+    # Vector database - use more robust path in production
+    VECTOR_DB_PATH = _ENV.get('VECTOR_DB_PATH', f'{_BASE_DIR}/data/vector_db')
+
+# Only settings are exported by "from .settings import *" (settings_mgmt),
+# not the modules and helpers used to build them
+__all__ = [name for name in dir() if name.isupper() and not name.startswith('_')]
@@ -0,0 +1,17 @@
+"""
+Settings for management commands that never serve HTTP.
+
+Same as settings, minus the password validators and the apps and middleware
+only the web process uses, so django.setup() doesn't import django_filters,
+rest_framework, corsheaders and whitenoise. manage.py picks this module for
+the commands listed in MGMT_SETTINGS_COMMANDS when DJANGO_SETTINGS_MODULE
+isn't set.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import _CORE_APPS, _CORE_MIDDLEWARE
+
+INSTALLED_APPS = _CORE_APPS
+MIDDLEWARE = _CORE_MIDDLEWARE
+
+# None of these commands set passwords from user input
+AUTH_PASSWORD_VALIDATORS = []
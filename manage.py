@@ -3,9 +3,26 @@
 import os
 import sys
 
+# Commands that don't need the web-only apps, middleware or password
+# validators. collectstatic and check are left out since they need every
+# installed app, createsuperuser and changepassword since they validate
+# passwords.
+MGMT_SETTINGS_COMMANDS = {
+    'migrate',
+    'makemigrations',
+    'showmigrations',
+    'sqlmigrate',
+    'shell',
+    'dbshell',
+    'sync_planfix_data',
+    'update_vector_db',
+}
+
 
 def main():
     """Run administrative tasks."""
+    if len(sys.argv) > 1 and sys.argv[1] in MGMT_SETTINGS_COMMANDS:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'intelligent_assistant.settings_mgmt')
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'intelligent_assistant.settings')
     try:
         from django.core.management import execute_from_command_line